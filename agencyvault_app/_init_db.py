@@ -1,11 +1,179 @@
 # init_db.py (ROOT)
+# Deploy-time schema step (start.sh): create missing tables, then bring older
+# DBs up to date. Every check reads the catalog first, so a current DB gets no DDL.
+
+from sqlalchemy import text
 
 from agencyvault_app.database import engine
-from agencyvault_app.models import Base  # noqa: F401
+from agencyvault_app.models import ActionStatus, Base, LeadState, ensure_log_partitions, utcnow
+
+
+_INDEX_DDL = {
+    # Imports rely on a unique phone index for ON CONFLICT (older DBs had a plain one)
+    "uq_leads_phone": "CREATE UNIQUE INDEX IF NOT EXISTS uq_leads_phone ON leads (phone)",
+    "ix_lead_memory_key_updated": "CREATE INDEX IF NOT EXISTS ix_lead_memory_key_updated ON lead_memory (key, updated_at DESC)",
+    "ix_leads_state_created_at": "CREATE INDEX IF NOT EXISTS ix_leads_state_created_at ON leads (state, created_at)",
+    "ix_actions_pending_created_at": "CREATE INDEX IF NOT EXISTS ix_actions_pending_created_at ON actions (created_at) WHERE status = 'PENDING'",
+    "ix_leads_email_lower": "CREATE INDEX IF NOT EXISTS ix_leads_email_lower ON leads (lower(email))",
+    "ix_messages_lead_created": "CREATE INDEX IF NOT EXISTS ix_messages_lead_created ON messages (lead_id, created_at)",
+}
+
+
+# Indexes now covered by a composite/partial/unique/expression index above, or
+# never used by a query; every write was still paying to maintain them on older DBs.
+_INDEX_DROP = (
+    "ix_leads_state",
+    "ix_actions_status",
+    "ix_lead_memory_lead_id",
+    "ix_lead_memory_lead_id_key",
+    "ix_leads_email",
+    "ix_leads_timezone",
+    "ix_messages_lead_id",
+    "ix_audit_log_lead_id",
+    "ix_audit_log_run_id",
+    "ix_audit_log_event",
+    "ix_actions_created_at",
+    "ix_lead_memory_updated_at",
+    # Replaced by ix_lead_memory_key_updated (plain DESC; NULLS LAST broke sqlite)
+    "ix_lead_memory_key_updated_at",
+)
+
+
+# "table.column" for every timestamp the DB fills in on INSERT
+_SERVER_TS_COLUMNS = tuple(
+    f"{t.name}.{c.name}"
+    for t in Base.metadata.sorted_tables
+    for c in t.columns
+    if isinstance(getattr(c.server_default, "arg", None), utcnow)
+)
+
+
+_UPDATED_AT_TRIGGER_TABLES = ("leads", "lead_memory")
+_SET_UPDATED_AT_FN = """
+CREATE OR REPLACE FUNCTION av_set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := timezone('utc', now());
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade_schema():
+    # actions.payload_json was TEXT holding JSON on older DBs; convert it once
+    # to JSONB (the catalog check keeps later boots from touching the table).
+    try:
+        with engine.begin() as conn:
+            col_type = conn.execute(text(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_name = 'actions' AND column_name = 'payload_json'"
+            )).scalar()
+            if col_type == "text":
+                conn.execute(text(
+                    "ALTER TABLE actions ALTER COLUMN payload_json DROP DEFAULT, "
+                    "ALTER COLUMN payload_json TYPE jsonb USING COALESCE(NULLIF(payload_json, ''), '{}')::jsonb"
+                ))
+    except Exception as e:
+        print("STARTUP_PAYLOAD_JSONB_SKIPPED", str(e)[:300])
+
+    # lead_state / action_status were VARCHAR on older DBs. Convert only when
+    # every stored value is in the enum; otherwise leave the column alone.
+    for table, column, enum in (("leads", "state", LeadState), ("actions", "status", ActionStatus)):
+        try:
+            with engine.begin() as conn:
+                col_type = conn.execute(text(
+                    "SELECT data_type FROM information_schema.columns "
+                    "WHERE table_name = :t AND column_name = :c"
+                ), {"t": table, "c": column}).scalar()
+                if col_type != "character varying":
+                    continue
+                stray = conn.execute(
+                    text(f"SELECT 1 FROM {table} WHERE NOT ({column} = ANY(:vals)) LIMIT 1"),
+                    {"vals": list(enum.enums)},
+                ).first()
+                if stray:
+                    print("STARTUP_ENUM_SKIPPED", table, column, "values outside", enum.name)
+                    continue
+                enum.create(conn, checkfirst=True)
+                conn.execute(text(
+                    f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {enum.name} "
+                    f"USING {column}::{enum.name}"
+                ))
+        except Exception as e:
+            print("STARTUP_ENUM_SKIPPED", table, column, str(e)[:300])
+
+    # Timestamps are DB-filled (server_default utcnow()); older DBs created
+    # their columns without a default, so add it where the catalog lacks one.
+    try:
+        with engine.begin() as conn:
+            missing = set(conn.execute(text(
+                "SELECT table_name || '.' || column_name FROM information_schema.columns "
+                "WHERE table_schema = current_schema() AND column_default IS NULL "
+                "AND table_name || '.' || column_name = ANY(:cols)"
+            ), {"cols": list(_SERVER_TS_COLUMNS)}).scalars())
+            for col in _SERVER_TS_COLUMNS:
+                if col in missing:
+                    table, name = col.split(".")
+                    conn.execute(text(
+                        f"ALTER TABLE {table} ALTER COLUMN {name} SET DEFAULT timezone('utc', now())"
+                    ))
+    except Exception as e:
+        print("STARTUP_TS_DEFAULT_SKIPPED", str(e)[:300])
+
+    # updated_at on UPDATE is set by a row trigger, not bound by every flush
+    try:
+        with engine.begin() as conn:
+            have = set(conn.execute(
+                text("SELECT tgname FROM pg_trigger WHERE tgname = ANY(:names)"),
+                {"names": [f"{t}_set_updated_at" for t in _UPDATED_AT_TRIGGER_TABLES]},
+            ).scalars())
+            if len(have) < len(_UPDATED_AT_TRIGGER_TABLES):
+                conn.execute(text(_SET_UPDATED_AT_FN))
+            for t in _UPDATED_AT_TRIGGER_TABLES:
+                if f"{t}_set_updated_at" not in have:
+                    conn.execute(text(
+                        f"CREATE TRIGGER {t}_set_updated_at BEFORE UPDATE ON {t} "
+                        f"FOR EACH ROW EXECUTE FUNCTION av_set_updated_at()"
+                    ))
+    except Exception as e:
+        print("STARTUP_TRIGGER_SKIPPED", str(e)[:300])
+
+    # create_all() never adds indexes to existing tables; backfill them here.
+    # Catalog read first: DDL (and its table lock) only runs for indexes still
+    # missing, so normal boots of several workers don't queue on leads.
+    try:
+        with engine.connect() as conn:
+            present = set(conn.execute(
+                text("SELECT indexname FROM pg_indexes WHERE indexname = ANY(:names)"),
+                {"names": [*_INDEX_DDL, *_INDEX_DROP]},
+            ).scalars())
+    except Exception:
+        present = set()
+
+    # Each runs on its own so one failure (e.g. dupe phones) doesn't block the rest.
+    for name, ddl in _INDEX_DDL.items():
+        if name in present:
+            continue
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(ddl))
+        except Exception as e:
+            print("STARTUP_INDEX_SKIPPED", ddl, str(e)[:300])
+
+    for name in _INDEX_DROP:
+        if name not in present:
+            continue
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        except Exception as e:
+            print("STARTUP_INDEX_DROP_SKIPPED", name, str(e)[:300])
 
 
 def main():
     Base.metadata.create_all(bind=engine)
+    ensure_log_partitions(engine)
+    upgrade_schema()
     print("Database tables created or verified.")
 
 
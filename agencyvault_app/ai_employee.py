@@ -1,6 +1,6 @@
-import json
 import re
 from datetime import datetime, timedelta
+from functools import lru_cache
 from sqlalchemy.orm import Session
 
 from .models import Lead, Action, AgentRun, AuditLog, LeadMemory
@@ -11,6 +11,8 @@ BAD_NAME_WORDS = {
     "client", "customer", "policy", "quote", "applicant"
 }
 
+_NAME_CHARS_RE = re.compile(r"[^a-zA-Z\-']")
+
 # -------------------------
 # Helpers
 # -------------------------
@@ -34,20 +36,22 @@ def mem_set(db: Session, lead_id: int, key: str, value: str):
     row = db.query(LeadMemory).filter_by(lead_id=lead_id, key=key).first()
     if row:
         row.value = value
-        row.updated_at = _now()
     else:
         db.add(LeadMemory(
             lead_id=lead_id,
             key=key,
             value=value,
-            updated_at=_now(),
         ))
 
+@lru_cache(maxsize=8192)
 def safe_first_name(full_name: str) -> str:
     if not full_name:
         return ""
-    first = full_name.strip().split()[0].lower()
-    first = re.sub(r"[^a-zA-Z\-']", "", first).strip()
+    parts = full_name.split(None, 1)
+    if not parts:
+        return ""
+    first = parts[0].lower()
+    first = _NAME_CHARS_RE.sub("", first).strip()
     if not first or first in BAD_NAME_WORDS or len(first) < 2:
         return ""
     return first.capitalize()
@@ -83,21 +87,12 @@ def ai_schedule_appointment(db: Session, lead_id: int, reason: str):
     """
 
     # Existing appointments
-    appts = (
-        db.query(Action)
+    blocked = {
+        when
+        for (when,) in db.query(Action.payload_json["when"].as_string())
         .filter(Action.type == "APPOINTMENT")
-        .all()
-    )
-
-    blocked = set()
-    for a in appts:
-        try:
-            payload = json.loads(a.payload_json or "{}")
-            when = payload.get("when")
-            if when:
-                blocked.add(when)
-        except Exception:
-            pass
+        if when
+    }
 
     now = _now().replace(minute=0, second=0, microsecond=0)
     candidate = now + timedelta(hours=1)
@@ -113,10 +108,10 @@ def ai_schedule_appointment(db: Session, lead_id: int, reason: str):
         type="APPOINTMENT",
         status="PENDING",
         tool="calendar",
-        payload_json=json.dumps({
+        payload_json={
             "when": slot,
             "reason": reason,
-        }),
+        },
     ))
 
 # -------------------------
@@ -171,7 +166,7 @@ def plan_actions(db: Session, batch_size: int = 25) -> dict:
                 type="REVIEW",
                 status="PENDING",
                 tool="",
-                payload_json=json.dumps({"reason": "Bad phone format"}),
+                payload_json={"reason": "Bad phone format"},
             ))
             planned += 1
             continue
@@ -187,11 +182,11 @@ def plan_actions(db: Session, batch_size: int = 25) -> dict:
                 type="TEXT",
                 status="PENDING",
                 tool="twilio",
-                payload_json=json.dumps({
+                payload_json={
                     "due_at": now.isoformat(),
                     "message": sms1,
                     "reason": "speed_to_lead",
-                }),
+                },
             ))
             planned += 1
             _log(db, run.id, lead.id, "AI_PLANNED_TEXT", "Speed-to-lead SMS")
@@ -201,10 +196,10 @@ def plan_actions(db: Session, batch_size: int = 25) -> dict:
                 type="CALL",
                 status="PENDING",
                 tool="twilio",
-                payload_json=json.dumps({
+                payload_json={
                     "due_at": (now + timedelta(minutes=2)).isoformat(),
                     "reason": "speed_to_lead_call",
-                }),
+                },
             ))
             planned += 1
             _log(db, run.id, lead.id, "AI_PLANNED_CALL", "Speed-to-lead CALL")
@@ -213,7 +208,6 @@ def plan_actions(db: Session, batch_size: int = 25) -> dict:
             ai_schedule_appointment(db, lead.id, "speed_to_lead_call")
 
             lead.state = "WORKING"
-            lead.updated_at = now
 
         # -------------------------
         # WORKING → FOLLOW-UP
@@ -228,11 +222,11 @@ def plan_actions(db: Session, batch_size: int = 25) -> dict:
                     type="TEXT",
                     status="PENDING",
                     tool="twilio",
-                    payload_json=json.dumps({
+                    payload_json={
                         "due_at": (now + timedelta(minutes=5)).isoformat(),
                         "message": sms2,
                         "reason": "followup_nudge",
-                    }),
+                    },
                 ))
                 planned += 1
                 _log(db, run.id, lead.id, "AI_PLANNED_TEXT", "Follow-up nudge")
@@ -1,31 +1,41 @@
+import hmac
+import os
 from hashlib import sha256
 
+import bcrypt
+
 from fastapi import APIRouter, Request, Form, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from .database import SessionLocal
+from .database import get_db
+from .templating import templates
 from . import models
 
 router = APIRouter()
-templates = Jinja2Templates(directory="agencyvault_app/templates")
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Work factor: ~250ms per hash. Paid only on /login and /register; every other
+# request is authenticated by the session cookie (user_id), never re-hashed.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
 
 
 def hash_password(password: str) -> str:
-    return sha256(password.encode("utf-8")).hexdigest()
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("ascii")
+
+
+def _is_legacy_hash(password_hash: str) -> bool:
+    # Accounts created before bcrypt: unsalted sha256 hex digest
+    return len(password_hash) == 64 and not password_hash.startswith("$2")
 
 
 def verify_password(password: str, password_hash: str) -> bool:
-    return hash_password(password) == password_hash
+    if not password_hash:
+        return False
+    if _is_legacy_hash(password_hash):
+        return hmac.compare_digest(sha256(password.encode("utf-8")).hexdigest(), password_hash)
+    return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("ascii"))
 
 
 @router.get("/login", response_class=HTMLResponse)
@@ -41,13 +51,19 @@ async def login(
     db: Session = Depends(get_db),
 ):
     user = db.query(models.User).filter(models.User.email == email).first()
-    if not user or not verify_password(password, user.password_hash):
+    # bcrypt is deliberately slow: keep it off the event loop
+    if not user or not await run_in_threadpool(verify_password, password, user.password_hash):
         return templates.TemplateResponse(
             "login.html",
             {"request": request, "error": "Invalid email or password"},
             status_code=400,
         )
 
+    # Upgrade a legacy sha256 hash in place now that we have the plaintext
+    if _is_legacy_hash(user.password_hash):
+        user.password_hash = await run_in_threadpool(hash_password, password)
+        db.commit()
+
     request.session["user_id"] = user.id
     return RedirectResponse(url="/dashboard", status_code=303)
 
@@ -82,12 +98,15 @@ async def register(
     user = models.User(
         email=email,
         full_name=full_name,
-        password_hash=hash_password(password),
+        password_hash=await run_in_threadpool(hash_password, password),
     )
     db.add(user)
+    # PK is populated by INSERT .. RETURNING on flush; read it before commit
+    # expires the instance so no reload SELECT is needed
+    db.flush()
+    user_id = user.id
     db.commit()
-    db.refresh(user)
 
-    request.session["user_id"] = user.id
+    request.session["user_id"] = user_id
     return RedirectResponse(url="/dashboard", status_code=303)
 
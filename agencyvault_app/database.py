@@ -1,33 +1,96 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
-def _clean_database_url(url: str) -> str:
-    return (url or "").strip()
+# SQLAlchemy driver prefix for psycopg v3; Render hands out postgres:// URLs
+_PG_PREFIXES = ("postgres://", "postgresql://")
+_PSYCOPG_PREFIX = "postgresql+psycopg://"
 
-DATABASE_URL = _clean_database_url(os.getenv("DATABASE_URL"))
+def _db_url() -> str:
+    """
+    Read DATABASE_URL once at import, fail fast if it is missing and force
+    the psycopg v3 driver. Other modules import DATABASE_URL / engine from
+    here instead of re-reading the environment.
+    """
+    url = (os.getenv("DATABASE_URL") or "").strip()
+    if not url:
+        raise RuntimeError("DATABASE_URL is missing. Set it in Render environment variables.")
+    for prefix in _PG_PREFIXES:
+        if url.startswith(prefix):
+            return _PSYCOPG_PREFIX + url[len(prefix):]
+    return url
 
-if not DATABASE_URL:
-    raise RuntimeError("DATABASE_URL is missing. Set it in Render environment variables.")
-
-# Force psycopg v3 driver
-if DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+psycopg://", 1)
-elif DATABASE_URL.startswith("postgresql://"):
-    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+psycopg://", 1)
+DATABASE_URL = _db_url()
 
 class Base(DeclarativeBase):
     pass
 
+_SQLITE = DATABASE_URL.startswith("sqlite")
+_SQLITE_MEMORY = _SQLITE and (DATABASE_URL.rstrip("/") == "sqlite:" or ":memory:" in DATABASE_URL)
+
+# QueuePool sizing (Postgres). Per worker process: workers x (size + overflow)
+# must stay under the server's max_connections.
+if not _SQLITE:
+    _pool_kwargs = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800")),
+    }
+elif _SQLITE_MEMORY:
+    # An in-memory database lives and dies with its connection: share one
+    # across threads, or every threadpool request would see an empty schema
+    _pool_kwargs = {"poolclass": StaticPool}
+else:
+    # File sqlite: SQLAlchemy's default QueuePool, cross-thread checkouts allowed
+    _pool_kwargs = {}
+
+# psycopg v3 prepares a statement server-side once it has run prepare_threshold
+# times on a connection (default 5). The app repeats a handful of fixed queries
+# (worker queue, mem_get/mem_set, dashboard counts), so prepare on the 2nd run.
+# Set DB_PREPARE_THRESHOLD=none behind a transaction-mode pgbouncer.
+_connect_args = {}
+if _SQLITE:
+    _connect_args["check_same_thread"] = False
+elif DATABASE_URL.startswith(_PSYCOPG_PREFIX):
+    _pt = (os.getenv("DB_PREPARE_THRESHOLD") or "2").strip().lower()
+    _connect_args["prepare_threshold"] = None if _pt == "none" else int(_pt)
+
+# psycopg v3 has no executemany_mode; SQLAlchemy batches executemany INSERTs
+# into multi-VALUES pages itself ("insertmanyvalues"). Bigger pages = fewer roundtrips.
+# pre_ping costs a SELECT 1 round trip on every checkout; pool_recycle already
+# retires connections before the server's idle timeout. DB_POOL_PRE_PING=1
+# turns it back on for networks that drop idle connections sooner.
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,
+    pool_pre_ping=os.getenv("DB_POOL_PRE_PING", "0") == "1",
+    insertmanyvalues_page_size=int(os.getenv("DB_INSERT_PAGE_SIZE", "10000")),
+    # Compiled-SQL LRU; default 500 entries is tight once every ORM query
+    # variant (dashboard counts, worker, imports, memory lookups) is in play
+    query_cache_size=int(os.getenv("DB_QUERY_CACHE_SIZE", "1200")),
+    connect_args=_connect_args,
+    **_pool_kwargs,
 )
 
+# sqlite dev URLs: WAL lets readers run alongside the writer and, with
+# synchronous=NORMAL, commits skip the fsync per transaction of the default
+# rollback journal. Set once per new DBAPI connection, not per query.
+if _SQLITE:
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.close()
+
+# expire_on_commit=False: objects stay readable after commit without a
+# reload SELECT per instance (routes render right after committing)
 SessionLocal = sessionmaker(
     bind=engine,
     autoflush=False,
     autocommit=False,
+    expire_on_commit=False,
 )
 
 def get_db():
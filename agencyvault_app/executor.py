@@ -4,11 +4,11 @@ import time
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
-from .database import SessionLocal
-from .models import Action, Lead, AgentRun, AuditLog, Message
-from .twilio_client import send_lead_sms, make_call_with_recording
+from .database import SessionLocal, engine
+from .models import Action, Lead, AgentRun, AuditLog, Message, ensure_log_partitions
+from .twilio_client import get_config, send_lead_sms, make_call_with_recording
 
 
 # =========================
@@ -25,11 +25,12 @@ def _log(db: Session, run_id, lead_id, event, detail):
         lead_id=lead_id,
         event=event,
         detail=(detail or "")[:5000],
-        created_at=_now(),
     ))
 
 
-def _parse_payload(payload_json: str) -> dict:
+def _parse_payload(payload_json) -> dict:
+    if isinstance(payload_json, dict):
+        return payload_json
     try:
         return json.loads(payload_json or "{}")
     except Exception:
@@ -74,10 +75,20 @@ def allowed_to_contact(lead: Lead) -> bool:
 
 def run_executor_loop():
     sleep_s = int(os.getenv("EXECUTOR_SLEEP_SECONDS", "30"))
+    partitions_checked = None
 
     while True:
         print("WORKER IS RUNNING", datetime.utcnow())
 
+        # Daily: keep next months' log partitions in place ahead of time
+        today = datetime.utcnow().date()
+        if partitions_checked != today:
+            try:
+                ensure_log_partitions(engine)
+                partitions_checked = today
+            except Exception as e:
+                print("PARTITION_CHECK_FAILED", str(e)[:300])
+
         db = SessionLocal()
         run = None
 
@@ -99,6 +110,7 @@ def run_executor_loop():
             # ---- fetch actions
             actions = (
                 db.query(Action)
+                .options(selectinload(Action.lead).raiseload("*"))
                 .filter(Action.status == "PENDING")
                 .order_by(Action.created_at.asc())
                 .limit(20)
@@ -117,7 +129,7 @@ def run_executor_loop():
                     if not _due_ok(payload):
                         continue
 
-                    lead = db.query(Lead).filter_by(id=a.lead_id).first()
+                    lead = a.lead
                     if not lead:
                         a.status = "FAILED"
                         a.error = "Lead not found"
@@ -164,11 +176,10 @@ def run_executor_loop():
                             lead_id=lead.id,
                             direction="OUT",
                             channel="SMS",
-                            from_number=os.getenv("TWILIO_FROM_NUMBER", ""),
+                            from_number=get_config().from_number,
                             to_number=lead.phone,
                             body=msg,
                             provider_sid=sid or "",
-                            created_at=_now(),
                         ))
 
                         _log(db, run.id, lead.id, "TEXT_SENT", msg)
@@ -201,7 +212,6 @@ def run_executor_loop():
 
                     # ---- success
                     lead.last_contacted_at = _now()
-                    lead.updated_at = _now()
 
                     a.status = "SUCCEEDED"
                     a.finished_at = _now()
@@ -1,11 +1,20 @@
 from typing import List, Dict
 import csv
 import io
+import threading
 
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseDownload
 
+# Optional columnar CSV parsing (C++ multi-threaded reader)
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.csv as pac  # type: ignore
+    ARROW_OK = True
+except Exception:
+    ARROW_OK = False
+
 SCOPES = [
     "https://www.googleapis.com/auth/drive.readonly",
     "https://www.googleapis.com/auth/spreadsheets.readonly",
@@ -14,9 +23,30 @@ SCOPES = [
 def _creds(service_account_info: dict) -> Credentials:
     return Credentials.from_service_account_info(service_account_info, scopes=SCOPES)
 
+# build() parses the discovery document and constructs the whole resource tree;
+# keep one service per (api, version, service account). Per thread, because the
+# underlying httplib2 transport is not thread-safe.
+_services = threading.local()
+
+def _service(service_account_info: dict, api: str, version: str):
+    cache = getattr(_services, "cache", None)
+    if cache is None:
+        cache = _services.cache = {}
+    key = (
+        api,
+        version,
+        service_account_info.get("client_email"),
+        service_account_info.get("private_key_id"),
+    )
+    service = cache.get(key)
+    if service is None:
+        service = cache[key] = build(
+            api, version, credentials=_creds(service_account_info), cache_discovery=False
+        )
+    return service
+
 def import_google_sheet(service_account_info: dict, spreadsheet_id: str, range_name: str) -> List[Dict[str, str]]:
-    creds = _creds(service_account_info)
-    service = build("sheets", "v4", credentials=creds)
+    service = _service(service_account_info, "sheets", "v4")
 
     result = service.spreadsheets().values().get(
         spreadsheetId=spreadsheet_id,
@@ -39,26 +69,82 @@ def import_google_sheet(service_account_info: dict, spreadsheet_id: str, range_n
 
     return output
 
-def import_drive_csv(service_account_info: dict, file_id: str) -> List[Dict[str, str]]:
-    creds = _creds(service_account_info)
-    service = build("drive", "v3", credentials=creds)
-
-    request = service.files().get_media(fileId=file_id)
-    buffer = io.BytesIO()
-    downloader = MediaIoBaseDownload(buffer, request)
+# Download granularity for streamed media; MediaIoBaseDownload defaults to 100 MB
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+class _MediaStream(io.RawIOBase):
+    """
+    Read-only file over a Drive media request. Each read pulls the next
+    downloaded chunk on demand, so only about one chunk is held at a time.
+    """
+
+    def __init__(self, request):
+        self._sink = io.BytesIO()
+        self._downloader = MediaIoBaseDownload(self._sink, request, chunksize=DOWNLOAD_CHUNK_SIZE)
+        self._done = False
+        self._chunk = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._chunk and not self._done:
+            _, self._done = self._downloader.next_chunk()
+            self._chunk = memoryview(self._sink.getvalue())
+            self._sink.seek(0)
+            self._sink.truncate()
+        n = min(len(b), len(self._chunk))
+        b[:n] = self._chunk[:n]
+        self._chunk = self._chunk[n:]
+        return n
+
+def _open_media(request) -> io.BufferedReader:
+    return io.BufferedReader(_MediaStream(request), buffer_size=DOWNLOAD_CHUNK_SIZE)
+
+def _read_csv_dicts_arrow(stream: io.BufferedReader) -> List[Dict[str, str]]:
+    # Header consumed here so its names can type the columns below
+    first_line = stream.readline().decode("utf-8", errors="ignore")
+    headers = next(csv.reader([first_line]), [])
+    if not headers:
+        return []
 
-    done = False
-    while not done:
-        _, done = downloader.next_chunk()
+    # Every column as string, same as DictReader: keeps "+1" phones / leading zeros.
+    # open_csv parses batch by batch as the download streams in.
+    reader = pac.open_csv(
+        stream,
+        read_options=pac.ReadOptions(column_names=headers),
+        convert_options=pac.ConvertOptions(
+            column_types={h: pa.string() for h in headers},
+            strings_can_be_null=False,
+        ),
+    )
+    output: List[Dict[str, str]] = []
+    for batch in reader:
+        output.extend(batch.to_pylist())
+    return output
 
-    buffer.seek(0)
-    text = buffer.read().decode("utf-8", errors="ignore").splitlines()
-    reader = csv.DictReader(text)
-    return list(reader)
+def import_drive_csv(service_account_info: dict, file_id: str) -> List[Dict[str, str]]:
+    service = _service(service_account_info, "drive", "v3")
+
+    # pyarrow's threaded reader when installed. Arrow rejects ragged rows
+    # partway through the stream, so those files are fetched again for csv.
+    if ARROW_OK:
+        try:
+            return _read_csv_dicts_arrow(_open_media(service.files().get_media(fileId=file_id)))
+        except Exception:
+            pass
+
+    # Decode incrementally as csv pulls lines, chunk by chunk off the wire
+    text = io.TextIOWrapper(
+        _open_media(service.files().get_media(fileId=file_id)),
+        encoding="utf-8",
+        errors="ignore",
+        newline="",
+    )
+    return list(csv.DictReader(text))
 
 def import_google_doc_text(service_account_info: dict, file_id: str) -> str:
-    creds = _creds(service_account_info)
-    service = build("drive", "v3", credentials=creds)
+    service = _service(service_account_info, "drive", "v3")
 
     request = service.files().export_media(fileId=file_id, mimeType="text/plain")
     buffer = io.BytesIO()
@@ -1,5 +1,9 @@
+import asyncio
+import os
 import re
 import io
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict
 
 # ============================================================
@@ -13,6 +17,17 @@ try:
 except Exception:
     OCR_AVAILABLE = False
 
+# Preferred engine: libtesseract in-process. pytesseract forks the tesseract
+# CLI and reloads the language model for every image.
+try:
+    from PIL import Image
+    from tesserocr import PyTessBaseAPI
+    TESSEROCR_AVAILABLE = True
+except Exception:
+    TESSEROCR_AVAILABLE = False
+
+OCR_AVAILABLE = OCR_AVAILABLE or TESSEROCR_AVAILABLE
+
 
 # ============================================================
 # PDF SUPPORT
@@ -35,11 +50,53 @@ def extract_text_from_image_bytes(data: bytes) -> str:
 
     try:
         img = Image.open(io.BytesIO(data))
+        if TESSEROCR_AVAILABLE:
+            api = _tess_api()
+            api.SetImage(img)
+            return api.GetUTF8Text()
         return pytesseract.image_to_string(img)
     except Exception:
         return ""
 
 
+# One loaded engine per thread (a PyTessBaseAPI is not thread-safe), kept for
+# the life of the thread / OCR worker process
+_tess = threading.local()
+
+
+def _tess_api():
+    api = getattr(_tess, "api", None)
+    if api is None:
+        api = _tess.api = PyTessBaseAPI()
+    return api
+
+
+# Created on first use so importing this module (and every forked web
+# worker) doesn't spawn OCR processes nobody asked for
+_ocr_pool = None
+
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    global _ocr_pool
+    if _ocr_pool is None:
+        workers = int(os.getenv("OCR_PROCESSES") or os.cpu_count() or 1)
+        _ocr_pool = ProcessPoolExecutor(max_workers=workers)
+    return _ocr_pool
+
+
+async def extract_text_from_image_bytes_async(data: bytes) -> str:
+    """
+    extract_text_from_image_bytes() in a worker process.
+    Image decode + tesseract are CPU-bound; the event loop keeps serving
+    requests and several images are recognized in parallel.
+    """
+    if not OCR_AVAILABLE:
+        return ""
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_ocr_pool(), extract_text_from_image_bytes, data)
+
+
 def extract_text_from_pdf_bytes(data: bytes) -> str:
     """
     Extract text from typed PDFs.
@@ -62,6 +119,29 @@ def extract_text_from_pdf_bytes(data: bytes) -> str:
 # ONE NORMALIZER (CSV + PDF + IMAGE + DOC)
 # ============================================================
 
+_PHONE_RE = re.compile(r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}")
+
+
+def _resolve_csv_columns(keys) -> Dict[str, str]:
+    """
+    Map normalized header name ("phone number") -> original CSV key.
+    Later duplicates win, same as building a dict from the row.
+    """
+    cols: Dict[str, str] = {}
+    for k in keys:
+        if k:
+            cols[k.strip().lower()] = k
+    return cols
+
+
+def _cell(row: Dict, cols: Dict[str, str], name: str, default=None):
+    k = cols.get(name)
+    if k is None:
+        return default
+    v = row[k]
+    return v.strip() if isinstance(v, str) else v
+
+
 def normalize_to_leads(data) -> List[Dict[str, str]]:
     """
     Accepts:
@@ -78,34 +158,37 @@ def normalize_to_leads(data) -> List[Dict[str, str]]:
     # CASE 1: CSV
     # --------------------------------------------------------
     if isinstance(data, list):
+        # Header -> column resolution happens once per distinct header row
+        # (one per file), not by re-normalizing every key of every row
+        resolved: Dict[tuple, Dict[str, str]] = {}
+
         for row in data:
-            clean = {
-                k.strip().lower(): (v.strip() if isinstance(v, str) else v)
-                for k, v in row.items()
-                if k
-            }
+            keys = tuple(row)
+            cols = resolved.get(keys)
+            if cols is None:
+                cols = resolved[keys] = _resolve_csv_columns(keys)
 
             full_name = (
-                clean.get("full name")
-                or f"{clean.get('first name','')} {clean.get('last name','')}".strip()
+                _cell(row, cols, "full name")
+                or f"{_cell(row, cols, 'first name', '')} {_cell(row, cols, 'last name', '')}".strip()
             )
 
             lead = {
                 "full name": full_name or None,
                 "phone": (
-                    clean.get("phone")
-                    or clean.get("phone number")
-                    or clean.get("cell")
-                    or clean.get("cell phone")
-                    or clean.get("mobile")
+                    _cell(row, cols, "phone")
+                    or _cell(row, cols, "phone number")
+                    or _cell(row, cols, "cell")
+                    or _cell(row, cols, "cell phone")
+                    or _cell(row, cols, "mobile")
                 ),
-                "email": clean.get("email"),
-                "state": clean.get("state"),
-                "dob": clean.get("dob") or clean.get("date of birth"),
-                "coverage amount": clean.get("coverage amount"),
-                "coverage type": clean.get("coverage type"),
-                "source": clean.get("source"),
-                "reference": clean.get("lead id") or clean.get("reference"),
+                "email": _cell(row, cols, "email"),
+                "state": _cell(row, cols, "state"),
+                "dob": _cell(row, cols, "dob") or _cell(row, cols, "date of birth"),
+                "coverage amount": _cell(row, cols, "coverage amount"),
+                "coverage type": _cell(row, cols, "coverage type"),
+                "source": _cell(row, cols, "source"),
+                "reference": _cell(row, cols, "lead id") or _cell(row, cols, "reference"),
             }
 
             leads.append(lead)
@@ -126,7 +209,7 @@ def normalize_to_leads(data) -> List[Dict[str, str]]:
             current["full name"] = line.split(":", 1)[-1].strip()
 
         # Phone
-        elif re.search(r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}", line):
+        elif _PHONE_RE.search(line):
             current["phone"] = line
 
         # Email
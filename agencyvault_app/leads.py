@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from sqlalchemy import text
+from sqlalchemy import insert
 from agencyvault_app.database import engine
+from agencyvault_app.models import Lead
 
 router = APIRouter()
 
@@ -11,22 +12,20 @@ class LeadCreate(BaseModel):
     phone: str
 
 @router.post("/leads")
-async def create_lead(lead: LeadCreate):
+def create_lead(lead: LeadCreate):
+    # Core INSERT .. RETURNING: no Session / identity map for a one-row write
     try:
-        async with engine.begin() as conn:
-            result = await conn.execute(
-                text("""
-                    INSERT INTO leads (first_name, last_name, phone, status)
-                    VALUES (:first_name, :last_name, :phone, 'new')
-                    RETURNING id
-                """),
-                {
-                    "first_name": lead.first_name,
-                    "last_name": lead.last_name,
-                    "phone": lead.phone,
-                }
+        with engine.begin() as conn:
+            result = conn.execute(
+                insert(Lead)
+                .values(
+                    full_name=f"{lead.first_name} {lead.last_name}".strip(),
+                    phone=lead.phone,
+                    state="NEW",
+                )
+                .returning(Lead.id)
             )
-            lead_id = result.scalar()
+            lead_id = result.scalar_one()
 
         return {"id": str(lead_id), "status": "saved"}
 
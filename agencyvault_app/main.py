@@ -2,24 +2,36 @@
 # AgencyVault - AI Employee Command Center (single-file, copy/paste)
 # CHUNK 1/9 — imports, app init, core helpers, import normalization (SAFE + CLOSED)
 
+import asyncio
 import csv
+import hashlib
 import io
 import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import httpx
-from fastapi import FastAPI, UploadFile, File, Form, Request
+from fastapi import BackgroundTasks, Depends, FastAPI, UploadFile, File, Form, Request
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, Response
-from sqlalchemy import text, or_
-from sqlalchemy.orm import Session
+from jinja2 import Environment
+from markupsafe import Markup
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import and_, bindparam, event, func, insert, literal_column, or_, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, selectinload
 from zoneinfo import ZoneInfo
 
 # IMPORTANT: keep package-local imports (Render layout)
-from .database import engine, SessionLocal
-from .models import Base, Lead, LeadMemory, Action, AgentRun, AuditLog, Message
+from .database import engine, SessionLocal, get_db
+from ._init_db import main as init_db
+from .models import Base, Lead, LeadMemory, Action, AgentRun, AuditLog, Message, ensure_log_partitions
+from .static_files import STATIC_DIR, CachedStaticFiles, static_url
 
 # Twilio client functions (must exist in your codebase)
 from .twilio_client import send_alert_sms, send_lead_sms
@@ -47,8 +59,57 @@ try:
 except Exception:
     OCR_OK = False
 
+# Optional off-loop OCR (image_import's process pool)
+try:
+    from .image_import import extract_text_from_image_bytes_async  # type: ignore
+    OCR_POOL_OK = True
+except Exception:
+    OCR_POOL_OK = False
+
+# Optional columnar CSV parsing (C++ multi-threaded reader)
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.compute as pc  # type: ignore
+    import pyarrow.csv as pac  # type: ignore
+    ARROW_OK = True
+except Exception:
+    ARROW_OK = False
+
 
 app = FastAPI(title="AgencyVault - AI Employee")
+app.mount("/static", CachedStaticFiles(directory=str(STATIC_DIR)), name="static")
+
+
+# =========================
+# Per-request SQL statement count (opt-in, DB_QUERY_COUNT=1)
+# =========================
+# Makes N+1 regressions visible: every response carries X-DB-Queries, and
+# requests above DB_QUERY_WARN statements are logged.
+_REQ_QUERIES: ContextVar[Optional[List[int]]] = ContextVar("_REQ_QUERIES", default=None)
+
+if os.getenv("DB_QUERY_COUNT") == "1":
+    _QUERY_WARN = int(os.getenv("DB_QUERY_WARN", "15"))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_query(conn, cursor, statement, parameters, context, executemany):
+        # A mutable cell: sync routes run in a threadpool on a copy of the
+        # context, so the counter must be shared by reference, not re-set
+        cell = _REQ_QUERIES.get()
+        if cell is not None:
+            cell[0] += 1
+
+    @app.middleware("http")
+    async def _query_count_mw(req: Request, call_next):
+        cell = [0]
+        token = _REQ_QUERIES.set(cell)
+        try:
+            resp = await call_next(req)
+        finally:
+            _REQ_QUERIES.reset(token)
+        resp.headers["X-DB-Queries"] = str(cell[0])
+        if cell[0] > _QUERY_WARN:
+            print("DB_QUERY_COUNT_HIGH", req.method, req.url.path, cell[0])
+        return resp
 
 
 # =========================
@@ -56,17 +117,37 @@ app = FastAPI(title="AgencyVault - AI Employee")
 # =========================
 @app.on_event("startup")
 def _startup():
-    # Safe create; does not drop/alter tables
-    Base.metadata.create_all(bind=engine)
+    # Schema create + upgrade (catalog reads, backfilled DDL) runs once per
+    # deploy: start.sh runs _init_db and sets AV_INIT_DB=0, so web worker
+    # boots do no schema I/O at all.
+    if os.getenv("AV_INIT_DB", "1") == "1":
+        init_db()
+
+    # Log partitions are not schema-per-deploy: a month must have its
+    # partition before its first audit_log / messages write, even if no
+    # deploy or worker pass happened in between. Cheap when they exist.
+    try:
+        ensure_log_partitions(engine)
+    except Exception as e:
+        print("STARTUP_PARTITION_CHECK_FAILED", str(e)[:300])
+
+    # Open the first pooled connection now, so the first request doesn't pay
+    # connect + TLS + auth
+    try:
+        with engine.connect() as conn:
+            conn.execute(_HEALTH_SQL)
+    except Exception as e:
+        print("STARTUP_DB_WARMUP_FAILED", str(e)[:300])
 
 
 # =========================
 # Core helpers / sanitization
 # =========================
-_CONTROL_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
-_US_STATE_RE = re.compile(
-    r"^(AL|AK|AZ|AR|CA|CO|CT|DE|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|NM|NY|NC|ND|OH|OK|OR|PA|RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY)$",
-    re.I,
+_CONTROL_TABLE = dict.fromkeys([*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20)])
+# Exact two-letter match: a set lookup, no 50-way regex alternation per cell
+US_STATES = frozenset(
+    "AL AK AZ AR CA CO CT DE FL GA HI ID IL IN IA KS KY LA ME MD MA MI MN MS MO "
+    "MT NE NV NH NJ NM NY NC ND OH OK OR PA RI SC SD TN TX UT VT VA WA WV WI WY".split()
 )
 
 BAD_NAME_WORDS = {
@@ -77,10 +158,41 @@ BAD_NAME_WORDS = {
 }
 
 TIER_WORDS = {"bronze", "silver", "gold", "platinum", "fresh", "aged", "new", "goat", "ethos"}
+# Substring hint that a "name" may just be a vendor tier label; one alternation
+# scan instead of a Python loop of `in` checks
+_TIER_HINT_RE = re.compile(r"bronze|silver|gold|platinum|fresh|aged")
+# Whole cell is nothing but tier/junk words ("Gold, Fresh Lead"): one fullmatch
+# over the alternation instead of split() + a per-part set check
+_LABEL_WORDS_ONLY_RE = re.compile(
+    r"[\s,]*(?:{w})(?:[\s,]+(?:{w}))*[\s,]*".format(
+        w="|".join(sorted(map(re.escape, TIER_WORDS | BAD_NAME_WORDS), key=len, reverse=True))
+    )
+)
 
 PHONE_RE = re.compile(r"(\+?1?\s*\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})")
 EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
 
+_STRIP_DIGITS = str.maketrans("", "", "0123456789")
+_ASCII_NON_DIGITS = str.maketrans("", "", "".join(chr(c) for c in range(128) if not "0" <= chr(c) <= "9"))
+
+# Field-label words that disqualify a line from being a bare name (one scan)
+_NOT_NAME_LINE_RE = re.compile(r"inquiry|coverage|amount|address|city|state|zip|phone|email", re.I)
+
+# Compiled once: these run per cell / per text block during imports
+_NON_DIGIT_RE = re.compile(r"\D")
+_BLOCK_BOUNDARY_RE = re.compile(r"(?im)^\s*(inquiry\s*id|lead\s*id)\s*[:#]")
+_BLOCK_RULE_RE = re.compile(r"(?m)^\s*-{5,}\s*$|^\s*={5,}\s*$")
+_FIRST_NAME_RE = re.compile(r"(?im)^\s*First\s*Name\s*:\s*(.+)\s*$")
+_LAST_NAME_RE = re.compile(r"(?im)^\s*Last\s*Name\s*:\s*(.+)\s*$")
+_NAME_LINE_RE = re.compile(r"(?im)^\s*Name\s*:\s*(.+)\s*$")
+_TIER_RE = re.compile(r"(?im)\b(BRONZE|SILVER|GOLD|PLATINUM|FRESH|AGED|GOAT|ETHOS)\b")
+_STATE_LINE_RE = re.compile(r"(?im)^\s*State\s*:\s*([A-Za-z]{2})\s*$")
+_DOB_LINE_RE = re.compile(r"(?im)^\s*(DOB|Date of Birth|Birthdate)\s*:\s*(.+)\s*$")
+_COVERAGE_LINE_RE = re.compile(
+    r"(?im)^\s*(Requested Coverage|Coverage Amount|Face Value|Current Coverage Amount)\s*:\s*([$]?\s*[\d,]+)\s*$"
+)
+_INQUIRY_LINE_RE = re.compile(r"(?im)^\s*(Inquiry\s*Id|Inquiry\s*ID|Lead\s*Id|Lead\s*ID)\s*[:#]\s*(.+)\s*$")
+
 
 def _now() -> datetime:
     return datetime.utcnow()
@@ -89,13 +201,32 @@ def _now() -> datetime:
 def clean_text(val: Any) -> Optional[str]:
     if val is None:
         return None
-    s = _CONTROL_RE.sub("", str(val)).replace("\x00", "").strip()
+    s = str(val)
+    # isprintable() is a C-level scan; only strings with \t/\n/control chars pay for the filter
+    if not s.isprintable():
+        s = s.translate(_CONTROL_TABLE)
+    s = s.strip()
     return s or None
 
 
+PHONE_MAX_LEN = 32
+
+
 def normalize_phone(val: Any) -> Optional[str]:
-    s = clean_text(val) or ""
-    digits = re.sub(r"\D", "", s)
+    if val is None:
+        return None
+    return _normalize_phone_str(str(val))
+
+
+@lru_cache(maxsize=65536)
+def _normalize_phone_str(raw: str) -> Optional[str]:
+    # Cached: the same number shows up across vendor lists and re-uploads
+    s = clean_text(raw) or ""
+    # Blank cells and long free text can't be a phone; skip the digit scan
+    if not s or len(s) > PHONE_MAX_LEN:
+        return None
+    # translate() is a fixed char-class filter in C; regex only for non-ASCII input
+    digits = s.translate(_ASCII_NON_DIGITS) if s.isascii() else _NON_DIGIT_RE.sub("", s)
     if len(digits) == 10:
         return "+1" + digits
     if len(digits) == 11 and digits.startswith("1"):
@@ -110,39 +241,59 @@ def normalize_state(val: Any) -> Optional[str]:
     if not s:
         return None
     s2 = s.upper()
-    if _US_STATE_RE.match(s2):
+    if s2 in US_STATES:
         return s2
     return None
 
 
+def _digit_count(s: str) -> int:
+    return len(s) - len(s.translate(_STRIP_DIGITS))
+
+
 def safe_full_name(val: Any) -> str:
-    s = clean_text(val) or ""
-    s = re.sub(r"\s+", " ", s).strip()
+    if val is None:
+        return "Unknown"
+    return _safe_full_name_str(str(val))
+
+
+@lru_cache(maxsize=8192)
+def _safe_full_name_str(raw: str) -> str:
+    # Cached: imports see the same cells over and over (tier labels, blanks,
+    # and names already cleaned by normalize_csv_rows)
+    s = clean_text(raw) or ""
+    # str.split() collapses whitespace in C; no regex pass needed
+    s = " ".join(s.split())
     if not s:
         return "Unknown"
+
+    # Cheap reject first: phone/ID-looking cells never reach the word checks
+    if _digit_count(s) >= 2:
+        return "Unknown"
+
     low = s.lower()
 
     if low in BAD_NAME_WORDS:
         return "Unknown"
 
-    if any(x in low for x in ["bronze", "silver", "gold", "platinum", "fresh", "aged"]):
-        parts = [p for p in re.split(r"[\s,]+", low) if p]
-        if parts and all(p in TIER_WORDS or p in BAD_NAME_WORDS for p in parts):
-            return "Unknown"
-
-    if sum(c.isdigit() for c in s) >= 2:
+    if _TIER_HINT_RE.search(low) and _LABEL_WORDS_ONLY_RE.fullmatch(low):
         return "Unknown"
 
     return s[:200]
 
 
+@lru_cache(maxsize=8192)
 def safe_first_name(full_name: Optional[str]) -> str:
     if not full_name:
         return ""
-    first = (full_name.strip().split() or [""])[0].strip().lower()
-    if not first or first in BAD_NAME_WORDS or len(first) < 2:
+    # maxsplit=1: only the first word is needed, don't tokenize the rest
+    parts = full_name.split(None, 1)
+    if not parts:
+        return ""
+    first = parts[0].lower()
+    if len(first) < 2 or first in BAD_NAME_WORDS:
         return ""
-    if any(c.isdigit() for c in first):
+    # Fast path: a purely alphabetic word has no digits; otherwise one C-level count
+    if not first.isalpha() and _digit_count(first):
         return ""
     return first.capitalize()
 
@@ -153,7 +304,6 @@ def _log(db: Session, lead_id: Optional[int], run_id: Optional[int], event: str,
         run_id=run_id,
         event=(event or "")[:120],
         detail=(detail or "")[:5000],
-        created_at=_now(),
     ))
 
 
@@ -175,23 +325,50 @@ def mem_set(db: Session, lead_id: int, key: str, value: str):
     row = db.query(LeadMemory).filter_by(lead_id=lead_id, key=k).first()
     if row:
         row.value = v[:12000]
-        row.updated_at = _now()
     else:
         db.add(LeadMemory(
             lead_id=lead_id,
             key=k,
             value=v[:12000],
-            updated_at=_now(),
         ))
         
 
-def mem_bulk_set(db: Session, lead_id: int, d: Dict[str, Any]):
+def _mem_rows(lead_id: int, d: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    LeadMemory rows for d with mem_set()'s cleaning + truncation.
+    Empty values are dropped; later keys win.
+    """
+    vals: Dict[str, str] = {}
     for k, v in (d or {}).items():
         if v is None:
             continue
         vv = clean_text(v)
-        if vv:
-            mem_set(db, lead_id, k, vv)
+        kk = (k or "").strip()[:120]
+        if vv and kk:
+            vals[kk] = vv[:12000]
+
+    return [{"lead_id": lead_id, "key": k, "value": v} for k, v in vals.items()]
+
+
+def mem_bulk_set(db: Session, lead_id: int, d: Dict[str, Any]):
+    """
+    Upsert several LeadMemory keys at once: one SELECT for the keys that
+    already exist, one multi-row INSERT for the rest (not a SELECT per key).
+    """
+    by_key = {r["key"]: r for r in _mem_rows(lead_id, d)}
+    if not by_key:
+        return
+
+    existing = (
+        db.query(LeadMemory)
+        .filter(LeadMemory.lead_id == lead_id, LeadMemory.key.in_(list(by_key)))
+        .all()
+    )
+    for row in existing:
+        row.value = by_key.pop(row.key)["value"]
+
+    if by_key:
+        db.execute(LeadMemory.__table__.insert(), list(by_key.values()))
 
 
 def require_admin(req: Request, token_from_form: str = "") -> bool:
@@ -202,6 +379,20 @@ def require_admin(req: Request, token_from_form: str = "") -> bool:
     return token == want
 
 
+def html_with_etag(req: Request, body: bytes) -> Response:
+    """
+    HTML page with a content-hash ETag.
+    Phones poll these pages; an unchanged page goes back as a bodyless 304.
+    """
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "private, must-revalidate"}
+    inm = req.headers.get("if-none-match") or ""
+    if inm and (inm.strip() == "*" or etag in [t.strip() for t in inm.split(",")]):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=body, headers=headers)
+
+
+@lru_cache(maxsize=1)
 def owner_mobile() -> str:
     return (os.getenv("OWNER_MOBILE") or os.getenv("ALERT_PHONE_NUMBER") or "").strip()
 
@@ -228,9 +419,9 @@ def notify_owner(db: Session, lead: Optional[Lead], msg: str, tag: str = "OWNER_
 
 
 def dedupe_exists(db: Session, phone: Optional[str], email: Optional[str]) -> bool:
-    if phone and db.query(Lead).filter(Lead.phone == phone).first():
+    if phone and db.query(Lead.id).filter(Lead.phone == phone).first():
         return True
-    if email and db.query(Lead).filter(Lead.email == email).first():
+    if email and db.query(Lead.id).filter(func.lower(Lead.email) == email.lower()).first():
         return True
     return False
 
@@ -293,7 +484,61 @@ def _looks_like_header(row: List[str]) -> bool:
     return ("first" in low and "last" in low and "phone" in low) or ("email" in low and "phone" in low)
 
 
+def _read_csv_rows_arrow(data: bytes) -> List[List[str]]:
+    first_line = data.split(b"\n", 1)[0].decode("utf-8", errors="ignore")
+    ncols = len(next(csv.reader([first_line]), []))
+    if not ncols:
+        return []
+
+    # Every column as string: keeps leading zeros / "+1" phones intact
+    table = pac.read_csv(
+        io.BytesIO(data),
+        read_options=pac.ReadOptions(autogenerate_column_names=True),
+        convert_options=pac.ConvertOptions(
+            column_types={f"f{i}": pa.string() for i in range(ncols)},
+            strings_can_be_null=False,
+        ),
+    )
+    # Whitespace trim runs column-at-a-time in Arrow's C++ kernels, so the
+    # per-cell .strip() in normalize_csv_rows() finds nothing left to copy
+    columns = [pc.utf8_trim_whitespace(table.column(i)).to_pylist() for i in range(table.num_columns)]
+    return [[c or "" for c in r] for r in zip(*columns)]
+
+
+def read_csv_rows(data: bytes) -> List[List[str]]:
+    """
+    Parse raw CSV bytes into positional rows for normalize_csv_rows().
+    Uses pyarrow's C++ reader when installed; falls back to csv.reader
+    for ragged/odd files or when pyarrow is missing.
+    """
+    if not data:
+        return []
+    if ARROW_OK:
+        try:
+            return _read_csv_rows_arrow(data)
+        except Exception:
+            pass
+    return list(iter_csv_rows(io.BytesIO(data)))
+
+
+def iter_csv_rows(stream: IO[bytes]) -> Iterator[List[str]]:
+    """
+    Positional rows from a binary CSV stream, one at a time.
+    Decodes incrementally as csv pulls lines: memory stays flat however
+    large the file is.
+    """
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8", errors="ignore", newline="")
+    for r in csv.reader(text_stream):
+        if r:
+            yield r
+
+
 def normalize_csv_rows(rows: List[List[str]]) -> List[Dict[str, Any]]:
+    """List form of iter_csv_leads()."""
+    return list(iter_csv_leads(rows))
+
+
+def iter_csv_leads(rows: Iterable[List[str]]) -> Iterator[Dict[str, Any]]:
     """
     Your vendor positional CSV format (most common):
       0 First
@@ -305,31 +550,23 @@ def normalize_csv_rows(rows: List[List[str]]) -> List[Dict[str, Any]]:
       7 Email
       8 State
     """
-    out: List[Dict[str, Any]] = []
-    if not rows:
-        return out
-
-    start = 1 if isinstance(rows[0], list) and _looks_like_header(rows[0]) else 0
-
-    for r in rows[start:]:
+    at_start = True
+    for r in rows:
         if not isinstance(r, list):
             continue
+        if at_start:
+            at_start = False
+            if _looks_like_header(r):
+                continue
 
-        while len(r) < 9:
-            r.append("")
-
-        first = (r[0] or "").strip()
-        last = (r[1] or "").strip()
-        product = (r[2] or "").strip()
-        tier = (r[3] or "").strip()
-        phone = (r[4] or "").strip()
-        dob = (r[6] or "").strip() if len(r) > 6 else ""
-        email = (r[7] or "").strip() if len(r) > 7 else ""
-        st = (r[8] or "").strip() if len(r) > 8 else ""
+        # One pass over the 9 positional cells, padded once, then unpacked
+        cells = [(c or "").strip() for c in r[:9]]
+        cells += [""] * (9 - len(cells))
+        first, last, product, tier, phone, _, dob, email, st = cells
 
         full_name = safe_full_name(f"{first} {last}".strip())
 
-        out.append({
+        yield {
             "full_name": full_name,
             "phone": phone,
             "email": email,
@@ -338,9 +575,7 @@ def normalize_csv_rows(rows: List[List[str]]) -> List[Dict[str, Any]]:
             "product_interest": product,
             "tier": tier,
             "lead_source": "csv_vendor",
-        })
-
-    return out
+        }
 
 
 def _split_text_into_lead_blocks(raw: str) -> List[str]:
@@ -352,14 +587,12 @@ def _split_text_into_lead_blocks(raw: str) -> List[str]:
     if not t:
         return []
 
-    boundary = re.compile(r"(?im)^\s*(inquiry\s*id|lead\s*id)\s*[:#]")
-
     lines = t.splitlines()
     blocks: List[List[str]] = []
     cur: List[str] = []
 
     for line in lines:
-        if boundary.search(line) and cur:
+        if _BLOCK_BOUNDARY_RE.search(line) and cur:
             blocks.append(cur)
             cur = [line]
         else:
@@ -369,17 +602,23 @@ def _split_text_into_lead_blocks(raw: str) -> List[str]:
         blocks.append(cur)
 
     if len(blocks) <= 1:
-        alt = re.split(r"(?m)^\s*-{5,}\s*$|^\s*={5,}\s*$", t)
+        alt = _BLOCK_RULE_RE.split(t)
         alt = [a.strip() for a in alt if a.strip()]
         if len(alt) > 1:
             return alt
 
-    return ["\n".join(b).strip() for b in blocks if b and "\n".join(b).strip()]
+    out: List[str] = []
+    for b in blocks:
+        joined = "\n".join(b).strip()
+        if joined:
+            out.append(joined)
+    return out
 
 
 def _extract_contacts_from_block(block: str) -> Tuple[Optional[str], List[str], List[str]]:
     phones_raw = PHONE_RE.findall(block or "")
-    emails = EMAIL_RE.findall(block or "")
+    # Most blocks carry no email at all: one C-level '@' scan skips the regex
+    emails = EMAIL_RE.findall(block) if block and "@" in block else []
 
     norm_phones: List[str] = []
     for pr in phones_raw:
@@ -401,18 +640,18 @@ def _guess_name_from_block(block: str) -> str:
     first = None
     last = None
 
-    m = re.search(r"(?im)^\s*First\s*Name\s*:\s*(.+)\s*$", block)
+    m = _FIRST_NAME_RE.search(block)
     if m:
         first = clean_text(m.group(1))
 
-    m = re.search(r"(?im)^\s*Last\s*Name\s*:\s*(.+)\s*$", block)
+    m = _LAST_NAME_RE.search(block)
     if m:
         last = clean_text(m.group(1))
 
     if first or last:
         return safe_full_name(f"{first or ''} {last or ''}".strip())
 
-    m = re.search(r"(?im)^\s*Name\s*:\s*(.+)\s*$", block)
+    m = _NAME_LINE_RE.search(block)
     if m:
         return safe_full_name(m.group(1))
 
@@ -422,10 +661,9 @@ def _guess_name_from_block(block: str) -> str:
             continue
         if len(s) > 45:
             continue
-        low = s.lower()
-        if any(w in low for w in ["inquiry", "coverage", "amount", "address", "city", "state", "zip", "phone", "email"]):
+        if _NOT_NAME_LINE_RE.search(s):
             continue
-        if sum(c.isdigit() for c in s) >= 1:
+        if _digit_count(s):
             continue
         parts = s.split()
         if len(parts) >= 2 and all(len(p) >= 2 for p in parts[:2]):
@@ -448,30 +686,27 @@ def normalize_text_to_leads(raw: str) -> List[Dict[str, Any]]:
         name = _guess_name_from_block(b)
 
         tier = None
-        m = re.search(r"(?im)\b(BRONZE|SILVER|GOLD|PLATINUM|FRESH|AGED|GOAT|ETHOS)\b", b)
+        m = _TIER_RE.search(b)
         if m:
             tier = m.group(1).upper()
 
         us_state = None
-        m = re.search(r"(?im)^\s*State\s*:\s*([A-Za-z]{2})\s*$", b)
+        m = _STATE_LINE_RE.search(b)
         if m:
             us_state = normalize_state(m.group(1))
 
         dob = None
-        m = re.search(r"(?im)^\s*(DOB|Date of Birth|Birthdate)\s*:\s*(.+)\s*$", b)
+        m = _DOB_LINE_RE.search(b)
         if m:
             dob = clean_text(m.group(2))
 
         cov = None
-        m = re.search(
-            r"(?im)^\s*(Requested Coverage|Coverage Amount|Face Value|Current Coverage Amount)\s*:\s*([$]?\s*[\d,]+)\s*$",
-            b,
-        )
+        m = _COVERAGE_LINE_RE.search(b)
         if m:
             cov = clean_text(m.group(2))
 
         inquiry_id = None
-        m = re.search(r"(?im)^\s*(Inquiry\s*Id|Inquiry\s*ID|Lead\s*Id|Lead\s*ID)\s*[:#]\s*(.+)\s*$", b)
+        m = _INQUIRY_LINE_RE.search(b)
         if m:
             inquiry_id = clean_text(m.group(2))
 
@@ -496,6 +731,46 @@ def normalize_text_to_leads(raw: str) -> List[Dict[str, Any]]:
 # =========================
 # Import helper: insert/merge safely (NO extra Lead columns)
 # =========================
+# Built once at import so the compiled form is reused on every call.
+# On Postgres, xmax = 0 only on a freshly inserted row, so it reports created vs merged.
+_LEAD_UPSERT_INSERT = pg_insert(Lead).values(
+    full_name=bindparam("full_name"),
+    phone=bindparam("phone"),
+    email=bindparam("email"),
+    state="NEW",                          # workflow state
+    timezone=bindparam("timezone"),
+)
+_LEAD_UPSERT = _LEAD_UPSERT_INSERT.on_conflict_do_update(
+    index_elements=["phone"],
+    # No-op assignment: DO UPDATE (unlike DO NOTHING) returns the existing row.
+    # updated_at comes from the column's onupdate (and the row trigger).
+    set_={"phone": _LEAD_UPSERT_INSERT.excluded.phone},
+).returning(Lead.id, literal_column("xmax = 0").label("created"))
+
+# Other databases (sqlite dev DBs) have no xmax: look the phone up first
+_LEAD_ID_BY_PHONE = select(Lead.id).where(Lead.phone == bindparam("phone"))
+_LEAD_INSERT = insert(Lead).values(
+    full_name=bindparam("full_name"),
+    phone=bindparam("phone"),
+    email=bindparam("email"),
+    state="NEW",
+    timezone=bindparam("timezone"),
+).returning(Lead.id)
+
+
+def _upsert_lead(db: Session, params: Dict[str, Any]) -> Tuple[int, bool]:
+    """(lead_id, created) for params["phone"], inserting the lead if it is new."""
+    if db.get_bind().dialect.name == "postgresql":
+        # Dedup happens in Postgres (unique index on phone): one roundtrip,
+        # race-free, for both new and existing phones
+        lead_id, created = db.execute(_LEAD_UPSERT, params).one()
+        return lead_id, created
+    lead_id = db.execute(_LEAD_ID_BY_PHONE, {"phone": params["phone"]}).scalar()
+    if lead_id is not None:
+        return lead_id, False
+    return db.execute(_LEAD_INSERT, params).scalar_one(), True
+
+
 def import_one_lead(db: Session, item: Dict[str, Any], source_tag: str) -> Dict[str, Any]:
     """
     Returns:
@@ -509,152 +784,202 @@ def import_one_lead(db: Session, item: Dict[str, Any], source_tag: str) -> Dict[
     email = clean_text(item.get("email") or "")
     full_name = safe_full_name(item.get("full_name"))
 
-    existing = db.query(Lead).filter(Lead.phone == phone).first()
-    if existing:
-        extras = dict(item)
-        extras.pop("phone", None)
-        extras.pop("email", None)
-        extras.pop("full_name", None)
-
-        mem_set(db, existing.id, "source_tag", source_tag)
-        mem_set(db, existing.id, "source_type", source_tag)
-        mem_bulk_set(db, existing.id, extras)
-        existing.updated_at = _now()
-        return {"ok": True, "created": False, "merged": True, "skipped": False, "lead_id": existing.id}
-
-    tz = infer_timezone_from_phone(phone)
-
-    lead = Lead(
-        full_name=full_name or "Unknown",
-        phone=phone,                  # MANDATORY
-        email=email or None,
-        state="NEW",                  # workflow state
-        timezone=tz,
-        created_at=_now(),
-        updated_at=_now(),
-    )
-    db.add(lead)
-    db.flush()
-
     extras = dict(item)
     extras.pop("phone", None)
     extras.pop("email", None)
     extras.pop("full_name", None)
 
-    mem_set(db, lead.id, "source_tag", source_tag)
-    mem_set(db, lead.id, "source_type", source_tag)
-    mem_bulk_set(db, lead.id, extras)
+    lead_id, created = _upsert_lead(db, {
+        "full_name": full_name or "Unknown",
+        "phone": phone,                   # MANDATORY
+        "email": email or None,
+        "timezone": infer_timezone_from_phone(phone),
+    })
 
-    return {"ok": True, "created": True, "merged": False, "skipped": False, "lead_id": lead.id}
+    mem_bulk_set(db, lead_id, {"source_tag": source_tag, "source_type": source_tag, **(extras or {})})
 
+    return {"ok": True, "created": created, "merged": not created, "skipped": False, "lead_id": lead_id}
 
-# ===== END CHUNK 1/9 =====
-# =========================
-# Health / Root / Service worker
-# =========================
-@app.get("/health")
-def health():
-    with engine.begin() as conn:
-        conn.execute(text("SELECT 1"))
-    return {"ok": True}
 
+IMPORT_BATCH_SIZE = 1000
 
-@app.get("/")
-def root():
-    return RedirectResponse("/dashboard")
+# created_at/updated_at are left to the column server defaults; state is always
+# 'NEW' and is written as an untyped literal in the merge (a VARCHAR stage
+# column has no assignment cast to the lead_state enum)
+_LEAD_COPY_COLS = ("full_name", "phone", "email", "timezone", "dial_score")
+_LEAD_COPY_COLS_SQL = ", ".join(_LEAD_COPY_COLS)
 
+_LEAD_STAGE_DDL = text("""
+    CREATE TEMP TABLE IF NOT EXISTS lead_import_stage (
+        full_name VARCHAR(200),
+        phone VARCHAR(50),
+        email VARCHAR(255),
+        timezone VARCHAR(50),
+        dial_score INTEGER
+    ) ON COMMIT DELETE ROWS
+""")
 
-@app.get("/sw.js")
-def sw():
-    return Response(content="/* no-op service worker */", media_type="application/javascript")
+_LEAD_STAGE_MERGE = text(f"""
+    INSERT INTO leads ({_LEAD_COPY_COLS_SQL}, state)
+    SELECT {_LEAD_COPY_COLS_SQL}, 'NEW' FROM lead_import_stage
+    ON CONFLICT (phone) DO NOTHING
+    RETURNING phone, id
+""")
 
 
-# =========================
-# Worker execution (PENDING actions)
-# =========================
-def execute_pending_actions(db: Session, limit: int = 5) -> Dict[str, Any]:
-    nowv = _now()
-    executed = 0
-    failed = 0
-    skipped = 0
+_LEAD_STAGE_TRUNCATE = text("TRUNCATE lead_import_stage")
 
-    # NOTE: with_for_update(skip_locked=True) requires Postgres (you are on Postgres)
-    actions = (
-        db.query(Action)
-        .filter(Action.status == "PENDING")
-        .order_by(Action.created_at.asc())
-        .limit(limit)
-        .with_for_update(skip_locked=True)
-        .all()
-    )
 
-    for a in actions:
-        try:
-            payload = json.loads(a.payload_json or "{}")
+def _insert_new_leads(db: Session, values: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    INSERT .. ON CONFLICT (phone) DO NOTHING for one import batch.
+    Returns {phone: id} for rows actually created.
 
-            lead = db.query(Lead).filter_by(id=a.lead_id).first()
-            if not lead:
-                a.status = "FAILED"
-                a.error = "Lead missing"
-                failed += 1
-                continue
+    On psycopg v3 the rows are streamed with COPY into a temp staging table and
+    merged with one INSERT .. SELECT (COPY itself can't do ON CONFLICT/RETURNING).
+    Other drivers use a multi-VALUES INSERT.
+    """
+    conn = db.connection()
+    if conn.dialect.driver != "psycopg":
+        return dict(db.execute(
+            pg_insert(Lead)
+            .values(values)
+            .on_conflict_do_nothing(index_elements=["phone"])
+            .returning(Lead.phone, Lead.id)
+        ).all())
+
+    db.execute(_LEAD_STAGE_DDL)
+    raw = conn.connection.driver_connection
+    with raw.cursor() as cur:
+        with cur.copy(f"COPY lead_import_stage ({_LEAD_COPY_COLS_SQL}) FROM STDIN") as cp:
+            for v in values:
+                cp.write_row(tuple(v[c] for c in _LEAD_COPY_COLS))
+
+    new_ids = dict(db.execute(_LEAD_STAGE_MERGE).all())
+    # Same transaction may stage more batches before ON COMMIT clears it
+    db.execute(_LEAD_STAGE_TRUNCATE)
+    return new_ids
+
+
+def _mem_rows_for_new_lead(lead_id: int, source_tag: str, extras: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    LeadMemory rows mem_bulk_set() would write for a brand-new lead,
+    without the SELECT for existing keys (there are none yet).
+    """
+    return _mem_rows(lead_id, {"source_tag": source_tag, "source_type": source_tag, **(extras or {})})
 
-            # Due time (for scheduled calls/texts)
-            due_at = payload.get("due_at")
-            if due_at:
-                try:
-                    if nowv < datetime.fromisoformat(due_at):
-                        skipped += 1
-                        continue
-                except Exception:
-                    pass
 
-            # Quiet hours for outreach (but NOT for owner alerts)
-            tz_name = lead.timezone or infer_timezone_from_phone(lead.phone)
-            if not allowed_to_contact_now(tz_name):
+def import_leads(db: Session, items: Iterable[Dict[str, Any]], source_tag: str) -> Dict[str, Any]:
+    """
+    Bulk version of import_one_lead() for uploads.
+    New leads go in as one multi-row INSERT .. ON CONFLICT per batch, and their
+    memory as one more INSERT; only phones that already exist take the
+    per-row merge path. Caller commits.
+    `items` may be a generator: only one batch is held in memory at a time.
+    """
+    created = 0
+    merged = 0
+    skipped = 0
+
+    it = iter(items or [])
+    while True:
+        chunk = list(islice(it, IMPORT_BATCH_SIZE))
+        if not chunk:
+            break
+
+        batch: Dict[str, Dict[str, Any]] = {}
+        values: List[Dict[str, Any]] = []
+        merge_later: List[Dict[str, Any]] = []
+
+        for item in chunk:
+            phone = normalize_phone(item.get("phone") or "")
+            if not phone:
                 skipped += 1
                 continue
+            if phone in batch:
+                merge_later.append(item)
+                continue
+            batch[phone] = item
+            values.append({
+                "full_name": safe_full_name(item.get("full_name")) or "Unknown",
+                "phone": phone,
+                "email": clean_text(item.get("email") or "") or None,
+                "state": "NEW",
+                "timezone": infer_timezone_from_phone(phone),
+                "dial_score": 0,
+            })
+
+        if not values:
+            continue
 
-            if a.type == "TEXT":
-                # payload must have: to, message
-                send_lead_sms(payload["to"], payload["message"])
-            elif a.type == "CALL":
-                if not _make_call:
-                    raise RuntimeError("Call function not available in twilio_client.py")
-                _make_call(payload["to"], payload.get("lead_id"))
-            elif a.type == "APPOINTMENT":
-                # Appointments are "planned" items; worker doesn't call calendar yet.
-                a.status = "DONE"
-                a.finished_at = _now()
-                executed += 1
+        new_ids = _insert_new_leads(db, values)
+
+        existing: List[Dict[str, Any]] = []
+        mem_rows: List[Dict[str, Any]] = []
+        for phone, item in batch.items():
+            lead_id = new_ids.get(phone)
+            if lead_id is None:
+                existing.append(item)
                 continue
-            else:
-                raise RuntimeError(f"Unknown action type: {a.type}")
+            extras = dict(item)
+            extras.pop("phone", None)
+            extras.pop("email", None)
+            extras.pop("full_name", None)
+            mem_rows.extend(_mem_rows_for_new_lead(lead_id, source_tag, extras))
+            created += 1
 
-            a.status = "DONE"
-            a.finished_at = _now()
-            executed += 1
+        if mem_rows:
+            db.execute(LeadMemory.__table__.insert(), mem_rows)
 
-        except Exception as e:
-            a.status = "FAILED"
-            a.error = str(e)[:500]
-            failed += 1
+        for item in existing + merge_later:
+            import_one_lead(db, item, source_tag)
+            merged += 1
 
-    db.commit()
-    return {"ok": True, "executed": executed, "failed": failed, "skipped": skipped}
+    return {"ok": True, "created": created, "merged": merged, "skipped": skipped}
 
 
-# Allow GET so you can click it in browser
-@app.get("/worker/execute")
-def worker_execute(limit: int = 5):
-    db = SessionLocal()
-    try:
-        out = execute_pending_actions(db, limit=limit)
-        _log(db, None, None, "WORKER_EXECUTE", json.dumps(out)[:5000])
-        db.commit()
-        return out
-    finally:
-        db.close()
+# ===== END CHUNK 1/9 =====
+# =========================
+# Health / Root / Service worker
+# =========================
+# Render polls this constantly; the body never changes, so skip serialization
+_HEALTH_OK_JSON = b'{"ok":true}'
+_HEALTH_SQL = text("SELECT 1")
+
+
+@app.get("/health")
+def health():
+    with engine.begin() as conn:
+        conn.execute(_HEALTH_SQL)
+    return Response(content=_HEALTH_OK_JSON, media_type="application/json")
+
+
+# Browsers may reuse the redirect for an hour and go straight to /dashboard
+# instead of spending a round trip on "/" every visit
+_ROOT_REDIRECT_HEADERS = {"Cache-Control": "public, max-age=3600"}
+
+
+@app.get("/")
+def root():
+    return RedirectResponse("/dashboard", headers=_ROOT_REDIRECT_HEADERS)
+
+
+_SW_JS = b"/* no-op service worker */"
+# Content-hash ETag only: identical in every worker and across restarts, unlike
+# an import-time Last-Modified. no-cache (not max-age) so browsers revalidate
+# and pick up a new worker promptly.
+_SW_JS_HEADERS = {
+    "ETag": '"' + hashlib.blake2b(_SW_JS, digest_size=16).hexdigest() + '"',
+    "Cache-Control": "no-cache",
+}
+
+
+@app.get("/sw.js")
+def sw(req: Request):
+    inm = req.headers.get("if-none-match") or ""
+    if inm and _SW_JS_HEADERS["ETag"] in [t.strip() for t in inm.split(",")]:
+        return Response(status_code=304, headers=_SW_JS_HEADERS)
+    return Response(content=_SW_JS, media_type="application/javascript", headers=_SW_JS_HEADERS)
 
 
 # =========================
@@ -666,22 +991,13 @@ def ai_schedule_appointment(db: Session, lead_id: int, note: str = "Call") -> No
     - Picks next open 30-minute slot (string)
     - Creates an APPOINTMENT Action (PENDING)
     """
-    appts = (
-        db.query(Action)
+    # Only the "when" key leaves the DB; no payload decoding per appointment
+    blocked = {
+        when
+        for (when,) in db.query(Action.payload_json["when"].as_string())
         .filter(Action.type == "APPOINTMENT")
-        .order_by(Action.created_at.asc())
-        .all()
-    )
-
-    blocked = set()
-    for a in appts:
-        try:
-            payload = json.loads(a.payload_json or "{}")
-            when = payload.get("when")
-            if when:
-                blocked.add(str(when))
-        except Exception:
-            continue
+        if when
+    }
 
     now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
     candidate = now + timedelta(hours=1)
@@ -702,13 +1018,12 @@ def ai_schedule_appointment(db: Session, lead_id: int, note: str = "Call") -> No
         type="APPOINTMENT",
         status="PENDING",
         tool="internal",
-        payload_json=json.dumps({
+        payload_json={
             "when": slot,
             "note": note,
             "tz": "local",
             "name": "AI Scheduled Call",
-        }),
-        created_at=_now(),
+        },
     ))
     _log(db, lead_id, None, "AI_APPOINTMENT_PLANNED", f"slot={slot}")
 
@@ -732,14 +1047,24 @@ def plan_actions(db: Session, batch_size: int = 25) -> Dict[str, Any]:
         .all()
     )
 
+    # Plain dicts, written with one executemany below: the new Actions are
+    # never touched again in this session, so skip ORM object construction.
+    action_rows: List[Dict[str, Any]] = []
+
+    # Which of these leads already have a pending action: one IN query for
+    # the batch instead of a lookup per lead
+    has_pending = set()
+    if leads:
+        has_pending = {
+            lead_id for (lead_id,) in
+            db.query(Action.lead_id)
+            .filter(Action.lead_id.in_([l.id for l in leads]), Action.status == "PENDING")
+            .distinct()
+        }
+
     for lead in leads:
         # If already has pending action, skip
-        already = (
-            db.query(Action)
-            .filter(Action.lead_id == lead.id, Action.status == "PENDING")
-            .first()
-        )
-        if already:
+        if lead.id in has_pending:
             skipped += 1
             continue
 
@@ -749,108 +1074,146 @@ def plan_actions(db: Session, batch_size: int = 25) -> Dict[str, Any]:
             "You requested life insurance info — want a quick quote today?"
         )
 
-        db.add(Action(
-            lead_id=lead.id,
-            type="TEXT",
-            status="PENDING",
-            tool="twilio",
-            payload_json=json.dumps({
+        action_rows.append({
+            "lead_id": lead.id,
+            "type": "TEXT",
+            "status": "PENDING",
+            "tool": "twilio",
+            "payload_json": {
                 "to": lead.phone,
                 "message": msg,
                 "reason": "New lead: first touch text",
-            }),
-            created_at=_now(),
-        ))
+            },
+            "error": "",
+        })
 
         lead.state = "WORKING"
-        lead.updated_at = _now()
         planned += 1
 
+    if action_rows:
+        db.bulk_insert_mappings(Action, action_rows)
+
     out = {"ok": True, "planned": planned, "skipped": skipped, "batch_size": int(batch_size)}
     _log(db, None, None, "AI_PLAN", json.dumps(out)[:5000])
     return out
 
 
 @app.get("/ai/plan")
-def ai_plan():
-    db = SessionLocal()
-    try:
-        out = plan_actions(db, batch_size=int(os.getenv("AI_BATCH_SIZE", "25")))
-        db.commit()
-        return out
-    finally:
-        db.close()
+def ai_plan(db: Session = Depends(get_db)):
+    out = plan_actions(db, batch_size=int(os.getenv("AI_BATCH_SIZE", "25")))
+    db.commit()
+    return out
 
 
-# ===== END CHUNK 2/9 =====
 # =========================
-# Agenda (single next task) + Workday start + Report outcome
+# Lead import (CSV / PDF / image upload)
 # =========================
-@app.get("/agenda", response_class=HTMLResponse)
-def agenda():
-    db = SessionLocal()
+_IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".gif", ".bmp", ".tif", ".tiff", ".webp")
+
+
+# Starlette keeps multipart files up to 1MB in memory (SpooledTemporaryFile)
+# and spools bigger ones to disk: only the former are parsed whole by Arrow
+CSV_ARROW_MAX_BYTES = 1024 * 1024
+
+
+def _upload_items(file: UploadFile) -> Tuple[str, Iterable[Dict[str, Any]]]:
+    """
+    (source_tag, leads) for an uploaded CSV or PDF. CSV leads come out as a
+    generator: import_leads() pulls one batch at a time straight off the
+    upload, so a large file is never held as bytes or as a list.
+    """
+    name = (file.filename or "").lower()
+    if name.endswith(".pdf"):
+        return "pdf_upload", normalize_text_to_leads(extract_text_from_pdf_bytes(file.file.read()))
+    if ARROW_OK and file.size is not None and file.size <= CSV_ARROW_MAX_BYTES:
+        return "csv_upload", iter_csv_leads(read_csv_rows(file.file.read()))
+    return "csv_upload", iter_csv_leads(iter_csv_rows(file.file))
+
+
+async def _ocr_image(data: bytes) -> str:
+    # Decode + tesseract are CPU-bound: run them in the OCR worker processes
+    # so the event loop keeps serving while a scan is recognized
+    if OCR_POOL_OK:
+        return await extract_text_from_image_bytes_async(data)
+    return await run_in_threadpool(extract_text_from_image_bytes, data)
+
+
+def _import_upload(db: Session, filename: str, items: Iterable[Dict[str, Any]], source_tag: str):
     try:
-        row = (
-            db.query(Action, Lead)
-            .join(Lead, Lead.id == Action.lead_id)
-            .filter(Action.status == "PENDING")
-            .order_by(Action.created_at.asc())
-            .first()
-        )
+        out = import_leads(db, items, source_tag)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print("LEAD_IMPORT_FAILED", filename, str(e)[:300])
+        return JSONResponse({"ok": False, "error": "import_failed"}, status_code=500)
 
-        if not row:
-            body = "<p>No tasks right now. Click <b>Start My Workday</b>.</p>"
-        else:
-            a, l = row
-            payload = {}
-            try:
-                payload = json.loads(a.payload_json or "{}")
-            except Exception:
-                payload = {}
+    print("LEAD_IMPORT", filename, out)
+    return out
 
-            reason = payload.get("reason", "AI decided this is next")
-            due = payload.get("due_at")
 
-            when = "Do now"
-            if due:
-                when = f"Scheduled for {due}"
+@app.post("/leads/import")
+async def leads_import(
+    req: Request,
+    file: UploadFile = File(...),
+    token: str = Form(""),
+    db: Session = Depends(get_db),
+):
+    """
+    Upload a vendor CSV, a PDF lead sheet or a scanned image and import every
+    lead with a phone.
+    Admin only: ADMIN_TOKEN as the `token` form field or X-Admin-Token header.
+    """
+    if not require_admin(req, token):
+        return JSONResponse({"ok": False, "error": "unauthorized"}, status_code=401)
+
+    filename = file.filename or ""
+    if filename.lower().endswith(_IMAGE_EXTS):
+        ocr_text = await _ocr_image(await file.read())
+        source_tag, items = "image_upload", normalize_text_to_leads(ocr_text)
+    else:
+        # Built here, consumed in the threadpool: the CSV generator reads
+        # the spooled upload file from there, never on the event loop
+        source_tag, items = await run_in_threadpool(_upload_items, file)
+
+    # Parsing and the DB writes are blocking: keep them off the event loop
+    return await run_in_threadpool(_import_upload, db, filename, items, source_tag)
 
-            # Helpful display for TEXT actions
-            msg = ""
-            if a.type == "TEXT":
-                msg = (payload.get("message") or "").strip()
-
-            msg_html = ""
-            if msg:
-                msg_html = f"""
-                <div style="margin-top:10px;">
-                  <div style="opacity:.8;font-size:13px;margin-bottom:6px;">Suggested text</div>
-                  <div style="white-space:pre-wrap;background:rgba(11,15,23,.65);border:1px solid rgba(50,74,110,.25);padding:12px;border-radius:14px;">
-                    {msg[:1200]}
-                  </div>
-                </div>
-                """
-
-            body = f"""
-            <h2 style="margin:0 0 10px 0;">Next Task</h2>
-
-            <div style="margin-top:10px;line-height:1.5">
-              <b>Lead:</b> {l.full_name or "Unknown"}<br>
-              <b>Phone:</b> {l.phone}<br>
-              <b>Status:</b> {l.state}
-            </div>
 
-            <div style="margin-top:10px;line-height:1.5">
-              <b>Action:</b> {a.type}<br>
-              <b>When:</b> {when}<br>
-              <b>Why:</b> {reason}
+# ===== END CHUNK 2/9 =====
+# =========================
+# Agenda (single next task) + Workday start + Report outcome
+# =========================
+# Static page chrome, built once; only the task body is formatted per request
+_AGENDA_HEAD_HTML = """
+        <html>
+        <head>
+          <meta name="viewport" content="width=device-width, initial-scale=1" />
+          <title>Agenda</title>
+        </head>
+        <body style="background:#0b0f17;color:#e6edf3;font-family:system-ui;padding:20px;max-width:980px;margin:0 auto;">
+          <div style="display:flex;justify-content:space-between;align-items:center;gap:12px;flex-wrap:wrap;">
+            <div>
+              <h1 style="margin:0;">AI Agenda</h1>
+              <div style="opacity:.75;font-size:13px;margin-top:2px;">Do tasks top-to-bottom. Report outcomes so AI can decide next steps.</div>
             </div>
+            <div style="display:flex;gap:10px;flex-wrap:wrap;">
+              <a href="/dashboard" style="color:#8ab4f8;text-decoration:none;font-weight:900;">Dashboard</a>
+              <a href="/actions" style="color:#8ab4f8;text-decoration:none;font-weight:900;">Action Queue</a>
+            </div>
+          </div>
 
-            {msg_html}
+          <div style="background:#0f1624;border:1px solid rgba(50,74,110,.25);border-radius:16px;padding:16px;margin-top:14px;">
+            """
+
+_AGENDA_TAIL_HTML = """
+          </div>
+        </body>
+        </html>
+        """
 
-            <form method="post" action="/agenda/report" style="margin-top:14px">
-              <input type="hidden" name="action_id" value="{a.id}" />
 
+# Outcome buttons never vary per task; only the hidden action_id above them does
+_AGENDA_REPORT_FORM_HTML = """
               <div style="opacity:.8;font-size:13px;margin-top:10px;">What happened?</div>
               <textarea name="note"
                 placeholder="Paste what the lead said or what happened"
@@ -879,98 +1242,153 @@ def agenda():
                 Tip: If they booked, include date/time + timezone in your note (e.g. "Jan 9 2pm Mountain").
               </div>
             </form>
-            """
+"""
 
-        return HTMLResponse(f"""
-        <html>
-        <head>
-          <meta name="viewport" content="width=device-width, initial-scale=1" />
-          <title>Agenda</title>
-        </head>
-        <body style="background:#0b0f17;color:#e6edf3;font-family:system-ui;padding:20px;max-width:980px;margin:0 auto;">
-          <div style="display:flex;justify-content:space-between;align-items:center;gap:12px;flex-wrap:wrap;">
-            <div>
-              <h1 style="margin:0;">AI Agenda</h1>
-              <div style="opacity:.75;font-size:13px;margin-top:2px;">Do tasks top-to-bottom. Report outcomes so AI can decide next steps.</div>
-            </div>
-            <div style="display:flex;gap:10px;flex-wrap:wrap;">
-              <a href="/dashboard" style="color:#8ab4f8;text-decoration:none;font-weight:900;">Dashboard</a>
-              <a href="/actions" style="color:#8ab4f8;text-decoration:none;font-weight:900;">Action Queue</a>
+
+@app.get("/agenda", response_class=HTMLResponse)
+def agenda(req: Request, db: Session = Depends(get_db)):
+    row = (
+        db.query(Action, Lead)
+        .join(Lead, Lead.id == Action.lead_id)
+        .filter(Action.status == "PENDING")
+        .order_by(Action.created_at.asc())
+        .first()
+    )
+
+    if not row:
+        body = "<p>No tasks right now. Click <b>Start My Workday</b>.</p>"
+    else:
+        a, l = row
+        payload = a.payload_json if isinstance(a.payload_json, dict) else {}
+
+        reason = payload.get("reason", "AI decided this is next")
+        due = payload.get("due_at")
+
+        when = "Do now"
+        if due:
+            when = f"Scheduled for {due}"
+
+        # Helpful display for TEXT actions
+        msg = ""
+        if a.type == "TEXT":
+            msg = (payload.get("message") or "").strip()
+
+        msg_html = ""
+        if msg:
+            msg_html = f"""
+            <div style="margin-top:10px;">
+              <div style="opacity:.8;font-size:13px;margin-bottom:6px;">Suggested text</div>
+              <div style="white-space:pre-wrap;background:rgba(11,15,23,.65);border:1px solid rgba(50,74,110,.25);padding:12px;border-radius:14px;">
+                {msg[:1200]}
+              </div>
             </div>
-          </div>
+            """
 
-          <div style="background:#0f1624;border:1px solid rgba(50,74,110,.25);border-radius:16px;padding:16px;margin-top:14px;">
-            {body}
-          </div>
-        </body>
-        </html>
-        """)
-    finally:
-        db.close()
+        head = f"""
+        <h2 style="margin:0 0 10px 0;">Next Task</h2>
+
+        <div style="margin-top:10px;line-height:1.5">
+          <b>Lead:</b> {l.full_name or "Unknown"}<br>
+          <b>Phone:</b> {l.phone}<br>
+          <b>Status:</b> {l.state}
+        </div>
+
+        <div style="margin-top:10px;line-height:1.5">
+          <b>Action:</b> {a.type}<br>
+          <b>When:</b> {when}<br>
+          <b>Why:</b> {reason}
+        </div>
+
+        {msg_html}
+
+        <form method="post" action="/agenda/report" style="margin-top:14px">
+          <input type="hidden" name="action_id" value="{a.id}" />
+
+        """
+
+        body = "".join((head, _AGENDA_REPORT_FORM_HTML))
+
+    return html_with_etag(req, "".join((_AGENDA_HEAD_HTML, body, _AGENDA_TAIL_HTML)).encode("utf-8"))
 
 
 @app.post("/workday/start")
-def start_workday():
+def start_workday(bg: BackgroundTasks):
     """
     Enterprise mode:
     - Plans work safely (no blocking sends)
+    - Planning runs after the response; the redirect doesn't wait on it
     - Sends user straight to /agenda
     """
+    bg.add_task(_plan_actions_job, int(os.getenv("AI_BATCH_SIZE", "25")))
+    return RedirectResponse("/agenda", status_code=303)
+
+
+def _plan_actions_job(batch_size: int) -> None:
+    # Background task: owns its session, the request's is long gone
     db = SessionLocal()
     try:
-        plan_actions(db, batch_size=int(os.getenv("AI_BATCH_SIZE", "25")))
+        plan_actions(db, batch_size=batch_size)
         db.commit()
+    except Exception as e:
+        db.rollback()
+        print("PLAN_ACTIONS_FAILED", str(e)[:300])
     finally:
         db.close()
 
-    return RedirectResponse("/agenda", status_code=303)
-
 
 @app.post("/agenda/report")
 def agenda_report(
     action_id: int = Form(...),
     outcome: str = Form(...),
     note: str = Form(""),
+    db: Session = Depends(get_db),
 ):
-    db = SessionLocal()
-    try:
-        action = db.query(Action).filter(Action.id == action_id).first()
-        if not action:
-            return RedirectResponse("/agenda", status_code=303)
-
-        lead = db.query(Lead).filter(Lead.id == action.lead_id).first()
-
-        # Mark the action as completed by human
-        action.status = "DONE"
-        action.finished_at = _now()
-
-        # Save human notes so AI can reason (lead may be missing if deleted)
-        if lead and note:
-            mem_set(db, lead.id, "last_human_note", note[:2000])
-
-        # Outcome log for planner
-        db.add(AuditLog(
-            lead_id=action.lead_id,
-            run_id=None,
-            event="HUMAN_OUTCOME",
-            detail=f"action_id={action.id} type={action.type} outcome={outcome} note={note[:1200]}",
-            created_at=_now(),
-        ))
+    # Action and its lead in one round-trip (outer join: the lead may be gone)
+    row = (
+        db.query(Action, Lead)
+        .outerjoin(Lead, Lead.id == Action.lead_id)
+        .filter(Action.id == action_id)
+        .first()
+    )
+    if not row:
+        return RedirectResponse("/agenda", status_code=303)
 
-        # Minimal workflow updates (safe defaults)
-        if lead:
-            if outcome in ["talked", "booked"]:
-                lead.state = "CONTACTED"
-            elif outcome in ["not_interested"]:
-                lead.state = "DO_NOT_CONTACT"
-                cancel_pending_actions(db, lead.id, "Human marked not interested")
-            else:
-                lead.state = "WORKING"
-            lead.updated_at = _now()
+    action, lead = row
 
-        db.commit()
-    finally:
-        db.close()
+    # Mark the action as completed by human
+    action.status = "DONE"
+    action.finished_at = _now()
+
+    # Save human notes so AI can reason (lead may be missing if deleted)
+    if lead and note:
+        mem_set(db, lead.id, "last_human_note", note[:2000])
+
+    # Outcome log for planner
+    db.add(AuditLog(
+        lead_id=action.lead_id,
+        run_id=None,
+        event="HUMAN_OUTCOME",
+        detail=f"action_id={action.id} type={action.type} outcome={outcome} note={note[:1200]}",
+    ))
+
+    # Minimal workflow updates (safe defaults)
+    if lead:
+        if outcome in ["talked", "booked"]:
+            lead.state = "CONTACTED"
+        elif outcome in ["not_interested"]:
+            lead.state = "DO_NOT_CONTACT"
+            # Nothing else queued for this lead may go out now (one UPDATE;
+            # autoflush writes this action's DONE first, so it isn't touched)
+            db.query(Action).filter(
+                Action.lead_id == lead.id, Action.status == "PENDING"
+            ).update(
+                {"status": "SKIPPED", "error": "Human marked not interested", "finished_at": _now()},
+                synchronize_session=False,
+            )
+        else:
+            lead.state = "WORKING"
+
+    db.commit()
 
     return RedirectResponse("/agenda", status_code=303)
 
@@ -979,8 +1397,6 @@ def agenda_report(
 # =========================
 # Dashboard helpers (SAFE)
 # =========================
-from sqlalchemy import or_
-
 def _kpi_card(label: str, value: Any, sub: str = "") -> str:
     return f"""
     <div class="kpi">
@@ -1003,7 +1419,11 @@ def _get_mem_map(db: Session, lead_ids: List[int]) -> Dict[int, Dict[str, str]]:
     """
     if not lead_ids:
         return {}
-    rows = db.query(LeadMemory).filter(LeadMemory.lead_id.in_(lead_ids)).all()
+    rows = (
+        db.query(LeadMemory.lead_id, LeadMemory.key, LeadMemory.value)
+        .filter(LeadMemory.lead_id.in_(lead_ids))
+        .all()
+    )
     out: Dict[int, Dict[str, str]] = {}
     for r in rows:
         out.setdefault(r.lead_id, {})[r.key] = r.value
@@ -1015,140 +1435,234 @@ def _upcoming_appts_local(db: Session, limit: int = 8) -> List[Dict[str, Any]]:
     Convention:
       - LeadMemory key 'appt_time' = ISO string
       - Optional 'appt_note'
+    Two queries total: appt_time joined to its lead, then the notes batched by id.
     """
     rows = (
-        db.query(LeadMemory)
+        db.query(LeadMemory.lead_id, LeadMemory.value, Lead.full_name, Lead.timezone)
+        .join(Lead, Lead.id == LeadMemory.lead_id)
         .filter(LeadMemory.key == "appt_time")
-        .order_by(LeadMemory.updated_at.desc().nullslast())
+        .order_by(LeadMemory.updated_at.desc())
         .limit(200)
         .all()
     )
 
-    items: List[Dict[str, Any]] = []
+    picked = []
     for r in rows:
-        lead = db.query(Lead).filter(Lead.id == r.lead_id).first()
-        if not lead:
-            continue
         when = (r.value or "").strip()
         if not when:
             continue
-        note = mem_get(db, lead.id, "appt_note") or ""
-        tz = lead.timezone or (os.getenv("DEFAULT_TIMEZONE") or "America/Denver")
+        picked.append((r, when))
+        if len(picked) >= limit:
+            break
+
+    notes: Dict[int, str] = {}
+    if picked:
+        notes = dict(
+            db.query(LeadMemory.lead_id, LeadMemory.value)
+            .filter(
+                LeadMemory.key == "appt_note",
+                LeadMemory.lead_id.in_([r.lead_id for r, _ in picked]),
+            )
+            .all()
+        )
+
+    default_tz = os.getenv("DEFAULT_TIMEZONE") or "America/Denver"
+    items: List[Dict[str, Any]] = []
+    for r, when in picked:
         items.append({
-            "lead_id": lead.id,
-            "name": lead.full_name or "Unknown",
+            "lead_id": r.lead_id,
+            "name": r.full_name or "Unknown",
             "when": when,
-            "tz": tz,
-            "note": note[:180],
+            "tz": r.timezone or default_tz,
+            "note": (notes.get(r.lead_id) or "")[:180],
         })
-        if len(items) >= limit:
-            break
     return items
 
 
 # =========================
 # Dashboard (header + stats)
 # =========================
-@app.get("/dashboard", response_class=HTMLResponse)
-def dashboard():
-    db = SessionLocal()
-    try:
-        total = db.query(Lead).count()
-        new = db.query(Lead).filter(Lead.state == "NEW").count()
-        working = db.query(Lead).filter(Lead.state == "WORKING").count()
-        contacted = db.query(Lead).filter(Lead.state == "CONTACTED").count()
-        dnc = db.query(Lead).filter(Lead.state == "DO_NOT_CONTACT").count()
-        pending = db.query(Action).filter(Action.status == "PENDING").count()
-        paused = (mem_get(db, 0, "GLOBAL_PAUSE") or "0") == "1"
-
-        # Activity feed (limited + safe)
-        logs = db.query(AuditLog).order_by(AuditLog.created_at.desc()).limit(18).all()
-        feed = ""
-        for l in logs:
-            feed += f"""
-            <div class="feed-item">
-              <div class="feed-top">
-                <div class="feed-title">{(l.event or "")}</div>
-                <div class="feed-time">{str(l.created_at)[:19]}</div>
-              </div>
-              <div class="feed-meta">lead={l.lead_id} run={l.run_id}</div>
-              <div class="feed-body">{(l.detail or "")[:280]}</div>
-            </div>
-            """
-
-        # Newest leads (with memory map)
-        leads = db.query(Lead).order_by(Lead.created_at.desc()).limit(12).all()
-        lead_ids = [x.id for x in leads]
-        mem_map = _get_mem_map(db, lead_ids)
-
-        leads_html = ""
-        for l in leads:
-            mem = mem_map.get(l.id, {})
-            us_state = mem.get("us_state") or mem.get("state") or "-"
-            cov = mem.get("coverage_requested") or mem.get("coverage") or "-"
-            tier = mem.get("tier") or "-"
-            prod = mem.get("product_interest") or mem.get("coverage_type") or "-"
-            leads_html += f"""
-            <div class="lead-row">
-              <div class="lead-main">
-                <div class="lead-name"><a href="/leads/{l.id}">#{l.id} {l.full_name or "Unknown"}</a></div>
-                <div class="lead-meta">{l.phone or "-"} | {l.email or "-"}</div>
-                <div class="lead-meta">Tier: {tier} | Product: {prod} | US: {us_state} | Coverage: {cov}</div>
-              </div>
-              <div class="lead-actions">
-                <form method="post" action="/leads/{l.id}/text-now" style="margin:0">
-                  <button class="mini" type="submit">Text Now</button>
-                </form>
-                <form method="post" action="/leads/{l.id}/call-now" style="margin:0">
-                  <button class="mini" type="submit">Call Now</button>
-                </form>
-                <span class="pill">{l.state}</span>
-              </div>
-            </div>
-            """
-
-        denom = max(total, 1)
-        pct_new = (new / denom) * 100.0
-        pct_working = (working / denom) * 100.0
-        pct_contacted = (contacted / denom) * 100.0
-        pct_dnc = (dnc / denom) * 100.0
-
-        # Calendar (local)
-        appts = _upcoming_appts_local(db, limit=8)
-        appt_html = ""
-        for a in appts:
-            appt_html += f"""
-            <div class="appt">
-              <div class="appt-top">
-                <div class="appt-title"><a href="/leads/{a["lead_id"]}">#{a["lead_id"]} {a["name"]}</a></div>
-                <div class="appt-when">{a["when"]} ({a["tz"]})</div>
-              </div>
-              <div class="appt-note">{a["note"] or ""}</div>
-            </div>
-            """
-        if not appt_html:
-            appt_html = '<div class="muted">No appointments stored yet.</div>'
-
-        pause_label = "Paused" if paused else "Running"
-
-        # --- HTML START ---
-        return HTMLResponse(f"""
+# Section fragments: compiled to bytecode once, autoescaped (lead names/notes are user data)
+_DASH_JINJA = Environment(autoescape=True, trim_blocks=True, lstrip_blocks=True)
+
+_FEED_TMPL = _DASH_JINJA.from_string("""
+{% for l in logs %}
+<div class="feed-item">
+  <div class="feed-top">
+    <div class="feed-title">{{ l.event or "" }}</div>
+    <div class="feed-time">{{ (l.created_at|string)[:19] }}</div>
+  </div>
+  <div class="feed-meta">lead={{ l.lead_id }} run={{ l.run_id }}</div>
+  <div class="feed-body">{{ (l.detail or "")[:280] }}</div>
+</div>
+{% endfor %}
+""")
+
+_LEAD_ROWS_TMPL = _DASH_JINJA.from_string("""
+{% for l in leads %}
+{% set mem = mem_map.get(l.id, {}) %}
+<div class="lead-row">
+  <div class="lead-main">
+    <div class="lead-name"><a href="/leads/{{ l.id }}">#{{ l.id }} {{ l.full_name or "Unknown" }}</a></div>
+    <div class="lead-meta">{{ l.phone or "-" }} | {{ l.email or "-" }}</div>
+    <div class="lead-meta">Tier: {{ mem.tier or "-" }} | Product: {{ mem.product_interest or mem.coverage_type or "-" }} | US: {{ mem.us_state or mem.state or "-" }} | Coverage: {{ mem.coverage_requested or mem.coverage or "-" }}</div>
+  </div>
+  <div class="lead-actions">
+    <form method="post" action="/leads/{{ l.id }}/text-now" style="margin:0">
+      <button class="mini" type="submit">Text Now</button>
+    </form>
+    <form method="post" action="/leads/{{ l.id }}/call-now" style="margin:0">
+      <button class="mini" type="submit">Call Now</button>
+    </form>
+    <span class="pill">{{ l.state }}</span>
+  </div>
+</div>
+{% endfor %}
+{% if next_before %}
+<a class="more" href="/dashboard?before={{ next_before }}">Older leads</a>
+{% endif %}
+""")
+
+_APPTS_TMPL = _DASH_JINJA.from_string("""
+{% for a in appts %}
+<div class="appt">
+  <div class="appt-top">
+    <div class="appt-title"><a href="/leads/{{ a.lead_id }}">#{{ a.lead_id }} {{ a.name }}</a></div>
+    <div class="appt-when">{{ a.when }} ({{ a.tz }})</div>
+  </div>
+  <div class="appt-note">{{ a.note or "" }}</div>
+</div>
+{% else %}
+<div class="muted">No appointments stored yet.</div>
+{% endfor %}
+""")
+
+# Page chrome; the three sections above arrive pre-rendered (Markup, already escaped)
+_DASHBOARD_TMPL = _DASH_JINJA.from_string("""
 <!doctype html>
 <html>
 <head>
 <meta name="viewport" content="width=device-width, initial-scale=1" />
 <title>AgencyVault - AI Employee</title>
-<!-- styles injected in chunk 5 -->
+<link rel="stylesheet" href="{{ css_url }}" />
 </head>
-<body>
-<!-- layout + content injected in chunk 5 -->
+<body style="background:#0b0f17;color:#e6edf3;font-family:system-ui;padding:20px;max-width:980px;margin:0 auto;">
+<div style="display:flex;justify-content:space-between;align-items:center;gap:12px;flex-wrap:wrap;">
+  <h1 style="margin:0;">AI Employee</h1>
+  <div style="display:flex;gap:10px;flex-wrap:wrap;align-items:center;">
+    <span class="pill">{{ pause_label }}</span>
+    <a href="/agenda" style="font-weight:900;">Agenda</a>
+  </div>
+</div>
+
+<div class="stats" style="display:flex;gap:14px;flex-wrap:wrap;margin-top:14px;">
+  <div class="stat">Total <b>{{ total }}</b></div>
+  <div class="stat">New <b>{{ new }}</b> ({{ "%.0f"|format(pct_new) }}%)</div>
+  <div class="stat">Working <b>{{ working }}</b> ({{ "%.0f"|format(pct_working) }}%)</div>
+  <div class="stat">Contacted <b>{{ contacted }}</b> ({{ "%.0f"|format(pct_contacted) }}%)</div>
+  <div class="stat">Do not contact <b>{{ dnc }}</b> ({{ "%.0f"|format(pct_dnc) }}%)</div>
+  <div class="stat">Pending actions <b>{{ pending }}</b></div>
+</div>
+
+<h2>Newest leads</h2>
+<div class="leads">{{ leads_html }}</div>
+
+<h2>Appointments</h2>
+<div class="appts">{{ appt_html }}</div>
+
+<h2>Activity</h2>
+<div class="feed">{{ feed }}</div>
 </body>
 </html>
-        """)
-       return HTMLResponse(f""" ... """)
-   
-    finally:
-        db.close()
+""")
+
+
+DASHBOARD_LEADS_PAGE = 12
+
+
+@app.get("/dashboard", response_class=HTMLResponse)
+def dashboard(req: Request, before: Optional[int] = None, db: Session = Depends(get_db)):
+    # One GROUP BY pass over leads instead of a COUNT query per state
+    by_state = dict(db.query(Lead.state, func.count()).group_by(Lead.state).all())
+    total = sum(by_state.values())
+    new = by_state.get("NEW", 0)
+    working = by_state.get("WORKING", 0)
+    contacted = by_state.get("CONTACTED", 0)
+    dnc = by_state.get("DO_NOT_CONTACT", 0)
+    pending = db.query(Action).filter(Action.status == "PENDING").count()
+    paused = (mem_get(db, 0, "GLOBAL_PAUSE") or "0") == "1"
+
+    # Activity feed (limited + safe)
+    # Rendered columns only; detail is clipped in SQL so large payloads never leave the DB
+    logs = (
+        db.query(
+            AuditLog.event,
+            AuditLog.created_at,
+            AuditLog.lead_id,
+            AuditLog.run_id,
+            func.substr(AuditLog.detail, 1, 280).label("detail"),
+        )
+        .order_by(AuditLog.created_at.desc())
+        .limit(18)
+        .all()
+    )
+    feed = Markup(_FEED_TMPL.render(logs=logs))
+
+    # Newest leads (with memory map) — only the rendered columns, as plain rows.
+    # Keyset paging: ?before=<id of the last lead shown> continues after that
+    # row in (created_at, id) order, never OFFSET-scanning the skipped rows.
+    # id breaks ties: a bulk import stamps a whole batch with one created_at.
+    # The cursor's created_at is read back from the row itself, so the
+    # comparison is against the stored value, not a re-parsed timestamp.
+    q = db.query(Lead.id, Lead.full_name, Lead.phone, Lead.email, Lead.state, Lead.created_at)
+    if before is not None:
+        cursor_at = select(Lead.created_at).where(Lead.id == before).scalar_subquery()
+        q = q.filter(
+            or_(
+                Lead.created_at < cursor_at,
+                and_(Lead.created_at == cursor_at, Lead.id < before),
+            )
+        )
+    leads = q.order_by(Lead.created_at.desc(), Lead.id.desc()).limit(DASHBOARD_LEADS_PAGE + 1).all()
+    next_before = leads[DASHBOARD_LEADS_PAGE - 1].id if len(leads) > DASHBOARD_LEADS_PAGE else None
+    leads = leads[:DASHBOARD_LEADS_PAGE]
+    lead_ids = [x.id for x in leads]
+    mem_map = _get_mem_map(db, lead_ids)
+
+    leads_html = Markup(_LEAD_ROWS_TMPL.render(leads=leads, mem_map=mem_map, next_before=next_before))
+
+    denom = max(total, 1)
+    pct_new = (new / denom) * 100.0
+    pct_working = (working / denom) * 100.0
+    pct_contacted = (contacted / denom) * 100.0
+    pct_dnc = (dnc / denom) * 100.0
+
+    # Calendar (local)
+    appts = _upcoming_appts_local(db, limit=8)
+    appt_html = Markup(_APPTS_TMPL.render(appts=appts))
+
+    pause_label = "Paused" if paused else "Running"
+
+    body = _DASHBOARD_TMPL.render(
+        css_url=static_url("styles.css"),
+        pause_label=pause_label,
+        total=total,
+        new=new,
+        working=working,
+        contacted=contacted,
+        dnc=dnc,
+        pending=pending,
+        pct_new=pct_new,
+        pct_working=pct_working,
+        pct_contacted=pct_contacted,
+        pct_dnc=pct_dnc,
+        leads_html=leads_html,
+        appt_html=appt_html,
+        feed=feed,
+    )
+    # ETag over the rendered page: any lead, stat or feed change busts the 304
+    return html_with_etag(req, body.encode("utf-8"))
+
 
 def _queue_action(db: Session, lead_id: int, action_type: str, payload: Dict[str, Any], tool: str = "internal") -> Optional[int]:
     try:
@@ -1157,8 +1671,7 @@ def _queue_action(db: Session, lead_id: int, action_type: str, payload: Dict[str
             type=action_type,
             status="PENDING",
             tool=tool,
-            payload_json=_safe_json(payload),
-            created_at=_now(),
+            payload_json=payload or {},
         )
         db.add(a)
         db.flush()
@@ -1174,16 +1687,7 @@ def _default_text_for_lead(lead: Lead) -> str:
         f"Hi{(' ' + first) if first else ''}, this is Nick's office. "
         "You requested life insurance info — want a quick quote today?"
     )
-    
-@app.get("/ai/plan")
-def ai_plan(batch_size: int = 25):
-    db = SessionLocal()
-    try:
-        out = plan_actions(db, batch_size=batch_size)
-        db.commit()
-        return out
-    finally:
-        db.close()
+
 
 # ===== END CHUNK 7/9 =====
 # =========================
@@ -1196,10 +1700,12 @@ def ai_plan(batch_size: int = 25):
 # - never double-executing actions
 
 def _parse_payload(a: Action) -> Dict[str, Any]:
-    try:
-        return json.loads(a.payload_json or "{}")
-    except Exception:
-        return {}
+    # JSON column: already decoded by the driver
+    p = a.payload_json
+    return p if isinstance(p, dict) else {}
+
+SEND_CONCURRENCY = int(os.getenv("SEND_CONCURRENCY", "8"))
+
 
 def execute_pending_actions(db: Session, limit: int = 5) -> Dict[str, Any]:
     limit = max(1, min(int(limit or 5), 50))
@@ -1209,8 +1715,12 @@ def execute_pending_actions(db: Session, limit: int = 5) -> Dict[str, Any]:
     failed = 0
     skipped = 0
 
+    sends: List[Tuple[Action, Any, Tuple[Any, ...]]] = []
+
+    # Leads for the whole batch in one IN query; nothing else on Lead is touched here
     actions = (
         db.query(Action)
+        .options(selectinload(Action.lead).raiseload("*"))
         .filter(Action.status == "PENDING")
         .order_by(Action.created_at.asc())
         .limit(limit)
@@ -1221,7 +1731,7 @@ def execute_pending_actions(db: Session, limit: int = 5) -> Dict[str, Any]:
     for a in actions:
         try:
             payload = _parse_payload(a)
-            lead = db.query(Lead).filter(Lead.id == a.lead_id).first()
+            lead = a.lead
 
             if not lead:
                 a.status = "FAILED"
@@ -1246,13 +1756,15 @@ def execute_pending_actions(db: Session, limit: int = 5) -> Dict[str, Any]:
                     skipped += 1
                     continue
 
-            # Execute
+            # Execute: Twilio sends are queued and fired together below
             if a.type == "TEXT":
-                send_lead_sms(payload.get("to"), payload.get("message"))
+                sends.append((a, send_lead_sms, (payload.get("to"), payload.get("message"))))
+                continue
             elif a.type == "CALL":
                 if not _make_call:
                     raise RuntimeError("Call function not configured")
-                _make_call(payload.get("to"), payload.get("lead_id"))
+                sends.append((a, _make_call, (payload.get("to"), payload.get("lead_id"))))
+                continue
             elif a.type == "APPOINTMENT":
                 # Appointments are planning artifacts only (no external call)
                 pass
@@ -1268,6 +1780,23 @@ def execute_pending_actions(db: Session, limit: int = 5) -> Dict[str, Any]:
             a.error = str(e)[:500]
             failed += 1
 
+    # Each Twilio REST call is a few hundred ms of pure network wait; run the
+    # batch concurrently. Only the worker threads touch Twilio, statuses are
+    # written back here on the session's own thread.
+    if sends:
+        with ThreadPoolExecutor(max_workers=min(len(sends), SEND_CONCURRENCY)) as pool:
+            futures = [(a, pool.submit(fn, *args)) for a, fn, args in sends]
+            for a, fut in futures:
+                try:
+                    fut.result()
+                    a.status = "DONE"
+                    a.finished_at = _now()
+                    executed += 1
+                except Exception as e:
+                    a.status = "FAILED"
+                    a.error = str(e)[:500]
+                    failed += 1
+
     return {
         "ok": True,
         "executed": executed,
@@ -1275,13 +1804,49 @@ def execute_pending_actions(db: Session, limit: int = 5) -> Dict[str, Any]:
         "skipped": skipped,
     }
 
+# Allow GET so you can click it in browser
 @app.get("/worker/execute")
-def worker_execute(limit: int = 5):
+def worker_execute(limit: int = 5, db: Session = Depends(get_db)):
+    out = execute_pending_actions(db, limit=limit)
+    _log(db, None, None, "WORKER_EXECUTE", json.dumps(out)[:5000])
+    db.commit()
+    return out
+
+
+# =========================
+# In-process AI cycle (opt-in, AI_POLL_SECONDS > 0)
+# =========================
+# Plan + execute on a timer inside the web process, calling the same functions
+# as /ai/plan and /worker/execute directly instead of an external cron making
+# HTTP requests to them. Off by default: the WORKER=1 service runs the executor.
+AI_POLL_SECONDS = int(os.getenv("AI_POLL_SECONDS", "0"))
+_ai_poller_task: Optional["asyncio.Task"] = None
+
+
+def _ai_cycle_job() -> None:
     db = SessionLocal()
     try:
-        out = execute_pending_actions(db, limit=limit)
-        _log(db, None, None, "WORKER_EXECUTE", json.dumps(out))
+        plan_actions(db, batch_size=int(os.getenv("AI_BATCH_SIZE", "25")))
+        db.commit()
+        out = execute_pending_actions(db, limit=int(os.getenv("AI_POLL_EXECUTE_LIMIT", "5")))
+        _log(db, None, None, "WORKER_EXECUTE", json.dumps(out)[:5000])
         db.commit()
-        return out
+    except Exception as e:
+        db.rollback()
+        print("AI_CYCLE_FAILED", str(e)[:300])
     finally:
         db.close()
+
+
+async def _ai_poller() -> None:
+    while True:
+        await asyncio.sleep(AI_POLL_SECONDS)
+        # Sync DB + Twilio work: off the event loop
+        await run_in_threadpool(_ai_cycle_job)
+
+
+@app.on_event("startup")
+async def _start_ai_poller():
+    global _ai_poller_task
+    if AI_POLL_SECONDS > 0:
+        _ai_poller_task = asyncio.create_task(_ai_poller())
@@ -1,54 +1,131 @@
 from __future__ import annotations
 from datetime import datetime
 
-from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, UniqueConstraint, Index
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from .database import Base
+from sqlalchemy import JSON, BigInteger, Column, Enum, Identity, String, Integer, DateTime, Text, ForeignKey, UniqueConstraint, Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Mapped, mapped_column, relationship, configure_mappers
+from sqlalchemy.sql.expression import FunctionElement
+from .database import Base, DATABASE_URL
+
+
+class utcnow(FunctionElement):
+    """
+    Naive UTC timestamp filled in by the database (column server_default).
+    INSERTs, single or executemany, don't bind a Python timestamp per row.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    # Columns are TIMESTAMP WITHOUT TIME ZONE holding UTC (datetime.utcnow)
+    return "timezone('utc', now())"
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+# Append-only, high-volume tables: 64-bit ids from an identity column (no
+# 32-bit ceiling). sqlite only autoincrements a plain INTEGER PRIMARY KEY.
+BigIntPK = BigInteger().with_variant(Integer, "sqlite")
+
+# Fixed vocabularies: native Postgres enums (4 bytes per value in rows and in
+# ix_leads_state_created_at), plain VARCHAR elsewhere. New values need
+# ALTER TYPE .. ADD VALUE on existing DBs.
+LEAD_STATES = ("NEW", "WORKING", "CONTACTED", "DO_NOT_CONTACT")
+ACTION_STATUSES = ("PENDING", "RUNNING", "SUCCEEDED", "DONE", "FAILED", "SKIPPED")
+LeadState = Enum(*LEAD_STATES, name="lead_state")
+ActionStatus = Enum(*ACTION_STATUSES, name="action_status")
+
+# JSONB on Postgres (binary, compact, no re-parse per read); plain JSON elsewhere.
+# Either way the attribute is a dict: callers never json.dumps/json.loads it.
+JSONDict = JSON().with_variant(JSONB(), "postgresql")
 
 class Lead(Base):
     __tablename__ = "leads"
+    __table_args__ = (
+        # Dedup key for imports (INSERT .. ON CONFLICT (phone) DO NOTHING)
+        Index("uq_leads_phone", "phone", unique=True),
+        # Planner: WHERE state = 'NEW' ORDER BY created_at LIMIT n
+        Index("ix_leads_state_created_at", "state", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     full_name: Mapped[str] = mapped_column(String(200), default="", nullable=False)
-    phone: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
-    email: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
+    phone: Mapped[str] = mapped_column(String(50), nullable=False)
+    # Indexed as lower(email) below (ix_leads_email_lower)
+    email: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
-    state: Mapped[str] = mapped_column(String(30), default="NEW", nullable=False, index=True)
+    # Indexed via ix_leads_state_created_at (state is its leading column)
+    state: Mapped[str] = mapped_column(LeadState, default="NEW", nullable=False)
 
     dial_score: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
-    product_interest: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Cold TEXT columns are deferred: list/queue queries over Lead/Action don't
+    # pull them; they load on first attribute access
+    product_interest: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
 
     last_contacted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow(), nullable=False, index=True)
+    # ORM UPDATEs stamp it via onupdate; on Postgres the leads_set_updated_at
+    # trigger (see _init_db) also covers raw SQL updates. sqlite has no trigger.
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=utcnow(), onupdate=utcnow(), nullable=False
+    )
 
-    actions: Mapped[list["Action"]] = relationship(back_populates="lead", cascade="all, delete-orphan")
-    memory: Mapped[list["LeadMemory"]] = relationship(back_populates="lead", cascade="all, delete-orphan")
-    messages: Mapped[list["Message"]] = relationship(back_populates="lead", cascade="all, delete-orphan")
+    # lazy="raise": touching a collection without an explicit selectinload()
+    # is an error, not a silent per-lead SELECT (N+1) in a list view.
+    # passive_deletes: the FKs are ON DELETE CASCADE, so deleting a lead
+    # doesn't need to load these first.
+    actions: Mapped[list["Action"]] = relationship(
+        back_populates="lead", cascade="all, delete-orphan", lazy="raise", passive_deletes=True
+    )
+    memory: Mapped[list["LeadMemory"]] = relationship(
+        back_populates="lead", cascade="all, delete-orphan", lazy="raise", passive_deletes=True
+    )
+    messages: Mapped[list["Message"]] = relationship(
+        back_populates="lead", cascade="all, delete-orphan", lazy="raise", passive_deletes=True
+    )
+    # Read per lead, never filtered on: no index to maintain on import
     timezone: Mapped[str | None] = mapped_column(
         String(50),
         nullable=True,
-        index=True,
     )
 
 class Action(Base):
     __tablename__ = "actions"
+    __table_args__ = (
+        # Worker/agenda: WHERE status = 'PENDING' ORDER BY created_at LIMIT n.
+        # Partial: only the pending queue is indexed, not every DONE/FAILED row.
+        Index(
+            "ix_actions_pending_created_at",
+            "created_at",
+            postgresql_where=text("status = 'PENDING'"),
+            sqlite_where=text("status = 'PENDING'"),
+        ),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    id: Mapped[int] = mapped_column(BigIntPK, Identity(always=True), primary_key=True)
     lead_id: Mapped[int] = mapped_column(ForeignKey("leads.id", ondelete="CASCADE"), nullable=False, index=True)
 
     type: Mapped[str] = mapped_column(String(40), nullable=False, index=True)
-    status: Mapped[str] = mapped_column(String(20), default="PENDING", nullable=False, index=True)
+    # Every status filter is status = 'PENDING': served by the partial index
+    status: Mapped[str] = mapped_column(ActionStatus, default="PENDING", nullable=False)
 
     tool: Mapped[str] = mapped_column(String(50), default="", nullable=False)
-    payload_json: Mapped[str] = mapped_column(Text, default="{}", nullable=False)
-    error: Mapped[str] = mapped_column(Text, default="", nullable=False)
+    payload_json: Mapped[dict] = mapped_column(JSONDict, default=dict, nullable=False)
+    error: Mapped[str] = mapped_column(Text, default="", nullable=False, deferred=True)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    # Only ever ordered within the pending queue: ix_actions_pending_created_at
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow(), nullable=False)
     started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
-    lead: Mapped["Lead"] = relationship(back_populates="actions")
+    # Same rule as Lead.actions: load with selectinload(Action.lead)
+    lead: Mapped["Lead"] = relationship(back_populates="actions", lazy="raise")
 
 class AgentRun(Base):
     __tablename__ = "agent_runs"
@@ -58,40 +135,72 @@ class AgentRun(Base):
     status: Mapped[str] = mapped_column(String(20), default="STARTED", nullable=False, index=True)
     batch_size: Mapped[int] = mapped_column(Integer, default=25, nullable=False)
     notes: Mapped[str] = mapped_column(Text, default="", nullable=False)
-    started_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow(), nullable=False, index=True)
     finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
 class LeadMemory(Base):
     __tablename__ = "lead_memory"
     __table_args__ = (
+        # Its unique index also serves lead_id-only and (lead_id, key) lookups
         UniqueConstraint("lead_id", "key", name="uq_lead_memory_lead_key"),
-        Index("ix_lead_memory_lead_id_key", "lead_id", "key"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    lead_id: Mapped[int] = mapped_column(ForeignKey("leads.id", ondelete="CASCADE"), nullable=False, index=True)
+    lead_id: Mapped[int] = mapped_column(ForeignKey("leads.id", ondelete="CASCADE"), nullable=False)
 
     key: Mapped[str] = mapped_column(String(100), nullable=False)
     value: Mapped[str] = mapped_column(Text, default="", nullable=False)
 
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    # Only read as (key, updated_at): ix_lead_memory_key_updated.
+    # Stamped via onupdate, plus the lead_memory_set_updated_at trigger on Postgres.
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=utcnow(), onupdate=utcnow(), nullable=False
+    )
 
-    lead: Mapped["Lead"] = relationship(back_populates="memory")
+    lead: Mapped["Lead"] = relationship(back_populates="memory", lazy="raise")
+
+# Email dedupe is case-insensitive: WHERE lower(email) = lower(:email)
+Index("ix_leads_email_lower", func.lower(Lead.email))
+
+# Dashboard calendar: WHERE key = 'appt_time' ORDER BY updated_at DESC
+# (updated_at is NOT NULL, so no NULLS ordering clause; sqlite rejects one here)
+Index(
+    "ix_lead_memory_key_updated",
+    LeadMemory.key,
+    LeadMemory.updated_at.desc(),
+)
+
+# Append-only logs, read by recent window or per lead: range-partitioned by
+# month on created_at (see ensure_log_partitions). Postgres requires the
+# partition key in the primary key, hence (id, created_at); sqlite dev DBs
+# can't autoincrement a composite key and keep a plain id PK.
+_LOG_PK_CREATED_AT = not DATABASE_URL.startswith("sqlite")
 
 class AuditLog(Base):
     __tablename__ = "audit_log"
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    lead_id: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
-    run_id: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
-    event: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
+
+    id: Mapped[int] = mapped_column(BigIntPK, Identity(always=True), primary_key=True)
+    # Written on nearly every request, only ever read newest-first (created_at):
+    # no per-column indexes to maintain on each insert
+    lead_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    run_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    event: Mapped[str] = mapped_column(String(100), nullable=False)
     detail: Mapped[str] = mapped_column(Text, default="", nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=utcnow(), nullable=False, primary_key=_LOG_PK_CREATED_AT, index=True
+    )
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # Thread view: WHERE lead_id = ? ORDER BY created_at DESC LIMIT n
+        Index("ix_messages_lead_created", "lead_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    lead_id: Mapped[int] = mapped_column(ForeignKey("leads.id", ondelete="CASCADE"), nullable=False, index=True)
+    id: Mapped[int] = mapped_column(BigIntPK, Identity(always=True), primary_key=True)
+    lead_id: Mapped[int] = mapped_column(ForeignKey("leads.id", ondelete="CASCADE"), nullable=False)
 
     direction: Mapped[str] = mapped_column(String(10), default="IN", nullable=False)  # IN/OUT
     channel: Mapped[str] = mapped_column(String(20), default="SMS", nullable=False)
@@ -101,9 +210,11 @@ class Message(Base):
     body: Mapped[str] = mapped_column(Text, default="", nullable=False)
 
     provider_sid: Mapped[str] = mapped_column(String(80), default="", nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=utcnow(), nullable=False, primary_key=_LOG_PK_CREATED_AT, index=True
+    )
 
-    lead: Mapped["Lead"] = relationship(back_populates="messages")
+    lead: Mapped["Lead"] = relationship(back_populates="messages", lazy="raise")
 
 class Task(Base):
     __tablename__ = "tasks"
@@ -126,6 +237,83 @@ class Task(Base):
     error: Mapped[str] = mapped_column(Text, default="", nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, nullable=False, index=True
+        DateTime, server_default=utcnow(), nullable=False, index=True
     )
     completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+PARTITIONED_LOG_TABLES = ("audit_log", "messages")
+
+
+def ensure_log_partitions(bind, months_ahead: int = 2) -> None:
+    """
+    Create this month's and the next `months_ahead` monthly partitions (plus a
+    DEFAULT catch-all) for each partitioned log table. Idempotent; a no-op off
+    Postgres or on older DBs where the table was created unpartitioned.
+    Retention is then DROP TABLE <table>_pYYYYMM instead of a bulk DELETE.
+
+    Must run before a month's first write: _init_db, every web worker's
+    startup and the worker loop (daily) all call it. Rows written with no
+    matching partition land in DEFAULT; those are moved into the new
+    partition before it is attached, since Postgres refuses to attach a
+    range the DEFAULT partition already holds rows for.
+    """
+    if bind.dialect.name != "postgresql":
+        return
+
+    today = datetime.utcnow().date().replace(day=1)
+    months = []
+    y, m = today.year, today.month
+    for _ in range(months_ahead + 1):
+        nxt = (y + 1, 1) if m == 12 else (y, m + 1)
+        months.append(((y, m), nxt))
+        y, m = nxt
+
+    with bind.begin() as conn:
+        # Every web worker runs this at boot: one at a time, so the others
+        # find the partitions already in place instead of racing the DDL
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('ensure_log_partitions'))"))
+        partitioned = set(conn.execute(
+            text(
+                "SELECT c.relname FROM pg_partitioned_table p "
+                "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = ANY(:names)"
+            ),
+            {"names": list(PARTITIONED_LOG_TABLES)},
+        ).scalars())
+
+        for table in PARTITIONED_LOG_TABLES:
+            if table not in partitioned:
+                continue
+            default = f"{table}_default"
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {default} PARTITION OF {table} DEFAULT"
+            ))
+
+            names = {f"{table}_p{y0:04d}{m0:02d}": (y0, m0, y1, m1) for (y0, m0), (y1, m1) in months}
+            have = set(conn.execute(
+                text("SELECT relname FROM pg_class WHERE relname = ANY(:names)"),
+                {"names": list(names)},
+            ).scalars())
+
+            for part, (y0, m0, y1, m1) in names.items():
+                if part in have:
+                    continue
+                lo, hi = f"{y0:04d}-{m0:02d}-01", f"{y1:04d}-{m1:02d}-01"
+                bounds = f"FOR VALUES FROM ('{lo}') TO ('{hi}')"
+                in_range = f"created_at >= '{lo}' AND created_at < '{hi}'"
+
+                if conn.execute(text(f"SELECT 1 FROM {default} WHERE {in_range} LIMIT 1")).first() is None:
+                    conn.execute(text(f"CREATE TABLE {part} PARTITION OF {table} {bounds}"))
+                    continue
+
+                # DEFAULT already caught this month's rows: build the partition
+                # standalone, move them over, then attach (same transaction)
+                conn.execute(text(f"CREATE TABLE {part} (LIKE {table} INCLUDING DEFAULTS)"))
+                conn.execute(text(f"INSERT INTO {part} SELECT * FROM {default} WHERE {in_range}"))
+                moved = conn.execute(text(f"DELETE FROM {default} WHERE {in_range}")).rowcount
+                conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {part} {bounds}"))
+                print("LOG_PARTITION_BACKFILLED", part, moved)
+
+
+# Resolve every relationship now, once at import, instead of lazily inside
+# whichever request happens to run the first query in each process
+configure_mappers()
@@ -0,0 +1,116 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, PathLike, StaticFiles
+from starlette.types import Scope
+
+# Optional brotli (smaller than gzip -9 for text assets)
+try:
+    import brotli  # type: ignore
+    BROTLI_OK = True
+except Exception:
+    BROTLI_OK = False
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+
+# ?v=<content hash> URLs never change content, so browsers keep them for a
+# year without revalidating; a deploy that edits the file changes the hash.
+# Bare URLs are revalidated (FileResponse's ETag / Last-Modified -> 304).
+_IMMUTABLE = "public, max-age=31536000, immutable"
+_REVALIDATE = "public, no-cache"
+
+# Text assets get .br / .gz siblings built once per deploy (start.sh runs this
+# module), so no response pays for compression at request time.
+_COMPRESSIBLE = {".css", ".js", ".json", ".svg", ".html", ".txt"}
+_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _compress(data: bytes, suffix: str) -> bytes:
+    if suffix == ".br":
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def precompress_static(root: Path = STATIC_DIR) -> int:
+    """Write missing or stale .br / .gz siblings for text assets under `root`."""
+    written = 0
+    suffixes = [".br", ".gz"] if BROTLI_OK else [".gz"]
+    for src in root.rglob("*"):
+        if not src.is_file() or src.suffix not in _COMPRESSIBLE:
+            continue
+        data = None
+        for suffix in suffixes:
+            dst = src.with_name(src.name + suffix)
+            if dst.exists() and dst.stat().st_mtime >= src.stat().st_mtime:
+                continue
+            if data is None:
+                data = src.read_bytes()
+            tmp = dst.with_name(dst.name + ".tmp")
+            tmp.write_bytes(_compress(data, suffix))
+            os.replace(tmp, dst)
+            written += 1
+    return written
+
+
+@lru_cache(maxsize=256)
+def _variant(full_path: str, suffix: str):
+    # Assets only change with a deploy: one stat per (file, encoding) per process
+    try:
+        return os.stat(full_path + suffix)
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=64)
+def static_url(path: str) -> str:
+    """/static URL for `path`, fingerprinted with its content hash (read once per process)."""
+    try:
+        data = (STATIC_DIR / path).read_bytes()
+    except OSError:
+        return f"/static/{path}"
+    return f"/static/{path}?v={hashlib.blake2b(data, digest_size=8).hexdigest()}"
+
+
+class CachedStaticFiles(StaticFiles):
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+
+        full_path = str(full_path)
+        headers = {"Vary": "Accept-Encoding"}
+        media_type = None
+        accept = request_headers.get("accept-encoding", "")
+        if status_code == 200 and os.path.splitext(full_path)[1] in _COMPRESSIBLE:
+            for encoding, suffix in _ENCODINGS:
+                if encoding not in accept:
+                    continue
+                st = _variant(full_path, suffix)
+                if st is not None and st.st_mtime >= stat_result.st_mtime:
+                    media_type = mimetypes.guess_type(full_path)[0] or "text/plain"
+                    headers["Content-Encoding"] = encoding
+                    full_path, stat_result = full_path + suffix, st
+                    break
+
+        response = FileResponse(
+            full_path, status_code=status_code, stat_result=stat_result, media_type=media_type, headers=headers
+        )
+        fingerprinted = b"v=" in scope.get("query_string", b"")
+        response.headers["Cache-Control"] = _IMMUTABLE if fingerprinted else _REVALIDATE
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+if __name__ == "__main__":
+    print("STATIC_PRECOMPRESSED", precompress_static())
@@ -0,0 +1,37 @@
+import os
+from pathlib import Path
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+
+from .static_files import static_url
+
+# One shared Environment for every router: each template is parsed and
+# compiled once per process, and the compiled bytecode is kept on disk so a
+# restarted worker skips the parse entirely.
+TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+
+templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+templates.env.globals["static_url"] = static_url
+
+# App-specific directory instead of jinja's per-user tmp default; point
+# JINJA_CACHE_DIR at a persistent disk to keep compiled bytecode across deploys.
+JINJA_CACHE_DIR = os.getenv("JINJA_CACHE_DIR", "/tmp/agencyvault-jinja")
+os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
+templates.env.bytecode_cache = FileSystemBytecodeCache(directory=JINJA_CACHE_DIR)
+
+# Templates ship with the deploy and never change under a running worker, so
+# skip the per-render mtime stat. TEMPLATES_AUTO_RELOAD=1 for local editing.
+templates.env.auto_reload = os.getenv("TEMPLATES_AUTO_RELOAD", "0") == "1"
+
+
+def warm_templates() -> None:
+    """Compile every template now (boot) instead of on its first request."""
+    for name in templates.env.list_templates(extensions=["html"]):
+        try:
+            templates.env.get_template(name)
+        except Exception as e:
+            print("TEMPLATE_WARM_FAILED", name, str(e)[:300])
+
+
+warm_templates()
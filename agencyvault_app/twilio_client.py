@@ -1,15 +1,42 @@
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from twilio.rest import Client
 
+def _env(name: str) -> str:
+    return (os.environ.get(name) or "").strip()
+
+@dataclass(frozen=True)
+class TwilioConfig:
+    account_sid: str
+    auth_token: str
+    from_number: str
+    alert_number: str
+    recording_webhook: str | None
+
+@lru_cache(maxsize=1)
+def get_config() -> TwilioConfig:
+    # Env is fixed for the process lifetime: one snapshot, read on first use
+    # (not at import, so the app still boots without Twilio configured)
+    return TwilioConfig(
+        account_sid=_env("TWILIO_ACCOUNT_SID"),
+        auth_token=_env("TWILIO_AUTH_TOKEN"),
+        from_number=_env("TWILIO_FROM_NUMBER"),
+        alert_number=_env("ALERT_PHONE_NUMBER"),
+        recording_webhook=_env("TWILIO_RECORDING_WEBHOOK") or None,
+    )
+
+@lru_cache(maxsize=1)
 def get_twilio_client() -> Client:
-    account_sid = (os.environ.get("TWILIO_ACCOUNT_SID") or "").strip()
-    auth_token = (os.environ.get("TWILIO_AUTH_TOKEN") or "").strip()
-    if not account_sid or not auth_token:
+    # One client per process: its HTTP session keeps the TLS connection to
+    # api.twilio.com alive across sends instead of a new handshake per message
+    cfg = get_config()
+    if not cfg.account_sid or not cfg.auth_token:
         raise RuntimeError("Twilio credentials missing (TWILIO_ACCOUNT_SID / TWILIO_AUTH_TOKEN).")
-    return Client(account_sid, auth_token)
+    return Client(cfg.account_sid, cfg.auth_token)
 
 def get_from_number() -> str:
-    from_number = (os.environ.get("TWILIO_FROM_NUMBER") or "").strip()
+    from_number = get_config().from_number
     if not from_number:
         raise RuntimeError("TWILIO_FROM_NUMBER is missing.")
     return from_number
@@ -17,7 +44,7 @@ def get_from_number() -> str:
 def send_alert_sms(message: str):
     client = get_twilio_client()
     from_number = get_from_number()
-    to_number = (os.environ.get("ALERT_PHONE_NUMBER") or "").strip()
+    to_number = get_config().alert_number
     if not to_number:
         raise RuntimeError("ALERT_PHONE_NUMBER is missing.")
     client.messages.create(body=message, from_=from_number, to=to_number)
@@ -37,7 +64,7 @@ def make_call(to_number: str, twiml_url: str):
         from_=from_number,
         url=twiml_url,
         record=True,
-        recording_status_callback=(os.environ.get("TWILIO_RECORDING_WEBHOOK") or "").strip() or None,
+        recording_status_callback=get_config().recording_webhook,
         recording_status_callback_event=["completed"],
         recording_status_callback_method="POST",
     )
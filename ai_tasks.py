@@ -1,14 +1,30 @@
+import threading
 from datetime import datetime
-from sqlalchemy import create_engine, text
-import os
+from sqlalchemy import text
 
-DATABASE_URL = os.getenv("DATABASE_URL", "").strip()
-DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+psycopg://")
+# Shared app engine: one sized pool per process instead of a
+# second default QueuePool (5 + 10 overflow) just for these inserts
+from agencyvault_app.database import engine
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+
+# DDL runs once per process, not as an extra transaction on every insert.
+# The lock keeps concurrent threadpool requests from racing the first run;
+# after that the unlocked flag check is all callers pay.
+_tables_ready = False
+_tables_lock = threading.Lock()
 
 
 def ensure_tables():
+    global _tables_ready
+    if _tables_ready:
+        return
+    with _tables_lock:
+        if not _tables_ready:
+            _create_tables()
+            _tables_ready = True
+
+
+def _create_tables():
     with engine.begin() as conn:
         conn.execute(text("""
             CREATE TABLE IF NOT EXISTS ai_tasks (
@@ -23,6 +39,14 @@ def ensure_tables():
             );
         """))
 
+        # Ready queue: WHERE status = 'NEW' AND due ORDER BY created_at LIMIT n.
+        # Partial, so only the (small) NEW backlog is indexed; walked in
+        # created_at order with the due_at check applied as a filter.
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ai_tasks_ready
+            ON ai_tasks (created_at) WHERE status = 'NEW'
+        """))
+
         conn.execute(text("""
             CREATE TABLE IF NOT EXISTS ai_events (
                 id SERIAL PRIMARY KEY,
@@ -33,14 +57,29 @@ def ensure_tables():
             );
         """))
 
+        # Per-lead event history, newest first
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ai_events_lead_created
+            ON ai_events (lead_id, created_at DESC)
+        """))
+
+
+# Built once; the engine's compiled cache then hits on every call
+_INSERT_TASK = text("""
+    INSERT INTO ai_tasks (task_type, lead_id, notes, due_at)
+    VALUES (:task_type, :lead_id, :notes, :due_at)
+""")
+
+_INSERT_EVENT = text("""
+    INSERT INTO ai_events (lead_id, event_type, message)
+    VALUES (:lead_id, :event_type, :message)
+""")
+
 
 def create_task(task_type, lead_id, notes=None, due_at=None):
     ensure_tables()
     with engine.begin() as conn:
-        conn.execute(text("""
-            INSERT INTO ai_tasks (task_type, lead_id, notes, due_at)
-            VALUES (:task_type, :lead_id, :notes, :due_at)
-        """), {
+        conn.execute(_INSERT_TASK, {
             "task_type": task_type,
             "lead_id": lead_id,
             "notes": notes,
@@ -51,10 +90,7 @@ def create_task(task_type, lead_id, notes=None, due_at=None):
 def log_event(lead_id, event_type, message=None):
     ensure_tables()
     with engine.begin() as conn:
-        conn.execute(text("""
-            INSERT INTO ai_events (lead_id, event_type, message)
-            VALUES (:lead_id, :event_type, :message)
-        """), {
+        conn.execute(_INSERT_EVENT, {
             "lead_id": lead_id,
             "event_type": event_type,
             "message": message
@@ -6,5 +6,15 @@ export PYTHONUNBUFFERED=1
 if [[ "${WORKER:-0}" == "1" ]]; then
   python -c "from agencyvault_app.executor import run_executor_loop; run_executor_loop()"
 else
-  uvicorn agencyvault_app.main:app --host 0.0.0.0 --port "${PORT:-10000}"
+  # Schema check once per deploy, not in every web worker's startup hook
+  python -m agencyvault_app._init_db
+  # .br / .gz siblings for /static, served by CachedStaticFiles
+  python -m agencyvault_app.static_files
+  # One process per core past the GIL; each worker has its own DB pool
+  # (DB_POOL_SIZE + DB_MAX_OVERFLOW) and, if AI_POLL_SECONDS is set, its own poller.
+  # uvloop + httptools ship with uvicorn[standard].
+  AV_INIT_DB=0 exec uvicorn agencyvault_app.main:app \
+    --host 0.0.0.0 --port "${PORT:-10000}" \
+    --workers "${WEB_CONCURRENCY:-2}" \
+    --loop uvloop --http httptools
 fi
@@ -0,0 +1,67 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+# The app reads DATABASE_URL at import: point it at a throwaway sqlite file first
+_DB_DIR = tempfile.mkdtemp(prefix="agencyvault-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ["AV_INIT_DB"] = "0"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+
+@pytest.fixture
+def engine():
+    from agencyvault_app.database import engine
+    from agencyvault_app.models import Base
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+
+
+@pytest.fixture
+def db(engine):
+    from agencyvault_app.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(engine):
+    from agencyvault_app.main import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def count_queries(engine):
+    """
+    Records every statement sent to the DB inside the block, so a test can
+    pin a route's query count and catch N+1 regressions:
+
+        with count_queries() as queries:
+            client.get("/dashboard")
+        assert len(queries) <= 8
+    """
+    @contextmanager
+    def _count():
+        queries = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            queries.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            yield queries
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+    return _count
@@ -0,0 +1,59 @@
+from agencyvault_app.models import Action, AuditLog, Lead
+
+
+def test_report_not_interested_skips_pending_actions(client, db):
+    lead = Lead(full_name="Jo Tester", phone="+15555550100", state="WORKING")
+    other = Lead(full_name="Sam Second", phone="+15555550102", state="WORKING")
+    db.add_all([lead, other])
+    db.flush()
+    reported = Action(lead_id=lead.id, type="CALL", status="PENDING")
+    queued = Action(lead_id=lead.id, type="TEXT", status="PENDING")
+    untouched = Action(lead_id=other.id, type="TEXT", status="PENDING")
+    db.add_all([reported, queued, untouched])
+    db.commit()
+    ids = reported.id, queued.id, untouched.id
+
+    r = client.post(
+        "/agenda/report",
+        data={"action_id": ids[0], "outcome": "not_interested", "note": "stop calling"},
+        follow_redirects=False,
+    )
+    assert r.status_code == 303
+
+    db.expire_all()
+    assert db.get(Lead, lead.id).state == "DO_NOT_CONTACT"
+    assert db.get(Action, ids[0]).status == "DONE"
+    skipped = db.get(Action, ids[1])
+    assert skipped.status == "SKIPPED"
+    assert skipped.error == "Human marked not interested"
+    assert db.get(Action, ids[2]).status == "PENDING"
+    assert db.query(AuditLog).filter(AuditLog.event == "HUMAN_OUTCOME").count() == 1
+
+
+def _queue_actions(db, n, type_="APPOINTMENT"):
+    for i in range(n):
+        lead = Lead(full_name=f"Lead {i:02d}", phone=f"+1555555{i:04d}", state="NEW")
+        db.add(lead)
+        db.flush()
+        db.add(Action(lead_id=lead.id, type=type_, status="PENDING", payload_json={}))
+    db.commit()
+
+
+def test_agenda_is_one_query(client, db, count_queries):
+    _queue_actions(db, 5)
+
+    with count_queries() as queries:
+        r = client.get("/agenda")
+    assert r.status_code == 200
+    assert "Lead 00" in r.text
+    assert len(queries) <= 1
+
+
+def test_worker_execute_query_count_is_per_batch(client, db, count_queries):
+    _queue_actions(db, 5)
+
+    with count_queries() as queries:
+        r = client.get("/worker/execute?limit=5")
+    assert r.json()["executed"] == 5
+    # Claim, leads (one IN), audit row, one executemany UPDATE for the batch
+    assert len(queries) <= 4
@@ -0,0 +1,78 @@
+import re
+
+from agencyvault_app.models import Lead, LeadMemory
+
+
+def test_dashboard_renders_leads(client, db):
+    db.add(Lead(full_name="Jo Tester", phone="+15555550100", state="NEW"))
+    db.commit()
+
+    r = client.get("/dashboard")
+    assert r.status_code == 200
+    assert "Jo Tester" in r.text
+    assert "+15555550100" in r.text
+    assert "Total <b>1</b>" in r.text
+
+
+def test_dashboard_escapes_lead_names(client, db):
+    db.add(Lead(full_name="<script>x</script>", phone="+15555550101", state="NEW"))
+    db.commit()
+
+    r = client.get("/dashboard")
+    assert "<script>x</script>" not in r.text
+    assert "&lt;script&gt;" in r.text
+
+
+def test_dashboard_older_leads_link_pages_through_every_lead(client, db):
+    # One batch: every row shares a created_at, so paging must tie-break on id
+    db.add_all(Lead(full_name=f"Lead {i:02d}", phone=f"+1555555{i:04d}", state="NEW") for i in range(30))
+    db.commit()
+
+    seen = []
+    url = "/dashboard"
+    while url:
+        r = client.get(url)
+        assert r.status_code == 200
+        seen += re.findall(r"#\d+ (Lead \d\d)", r.text)
+        m = re.search(r'href="(/dashboard\?before=\d+)"', r.text)
+        url = m.group(1) if m else None
+
+    assert sorted(seen) == [f"Lead {i:02d}" for i in range(30)]
+    assert len(seen) == len(set(seen))
+
+
+def test_dashboard_etag_revalidates_until_a_lead_changes(client, db):
+    db.add(Lead(full_name="Jo Tester", phone="+15555550100", state="NEW"))
+    db.commit()
+
+    first = client.get("/dashboard")
+    etag = first.headers["etag"]
+    again = client.get("/dashboard", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    db.add(Lead(full_name="Sam Second", phone="+15555550102", state="NEW"))
+    db.commit()
+
+    changed = client.get("/dashboard", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert "Sam Second" in changed.text
+
+
+def test_dashboard_query_count_does_not_grow_with_leads(client, db, count_queries):
+    for i in range(10):
+        lead = Lead(full_name=f"Lead {i:02d}", phone=f"+1555555{i:04d}", state="NEW")
+        db.add(lead)
+        db.flush()
+        db.add_all([
+            LeadMemory(lead_id=lead.id, key="tier", value="GOAT"),
+            LeadMemory(lead_id=lead.id, key="appt_time", value="2026-10-20T10:00:00"),
+        ])
+    db.commit()
+
+    with count_queries() as queries:
+        r = client.get("/dashboard")
+    assert r.status_code == 200
+    # Stats, pause flag, feed, lead page, its memory, calendar: no per-lead query
+    assert len(queries) <= 8
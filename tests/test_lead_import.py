@@ -0,0 +1,143 @@
+import pytest
+
+from agencyvault_app.models import Lead, LeadMemory
+
+VENDOR_CSV = (
+    b"First,Last,Product,Tier,Phone,,DOB,Email,State\n"
+    b"Jo,Tester,IUL,GOAT,(555) 555-0100,,01/02/1970,jo@example.com,TX\n"
+    b"Sam,Second,TERM,FRESH,555-555-0102,,,sam@example.com,FL\n"
+    b"No,Phone,TERM,AGED,,,,,CA\n"
+)
+
+
+def _upload(client, data=VENDOR_CSV, token="s3cret", filename="leads.csv"):
+    return client.post(
+        "/leads/import",
+        data={"token": token},
+        files={"file": (filename, data, "text/csv")},
+    )
+
+
+def test_csv_import_creates_leads_with_memory(client, db, monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "s3cret")
+
+    r = _upload(client)
+    assert r.status_code == 200
+    assert r.json() == {"ok": True, "created": 2, "merged": 0, "skipped": 1}
+
+    leads = {l.full_name: l for l in db.query(Lead).all()}
+    assert set(leads) == {"Jo Tester", "Sam Second"}
+    assert leads["Jo Tester"].email == "jo@example.com"
+
+    mem = dict(
+        db.query(LeadMemory.key, LeadMemory.value)
+        .filter(LeadMemory.lead_id == leads["Jo Tester"].id)
+        .all()
+    )
+    assert mem["tier"] == "GOAT"
+    assert mem["us_state"] == "TX"
+    assert mem["source_tag"] == "csv_upload"
+
+
+def test_csv_reupload_merges_existing_leads(client, db, monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "s3cret")
+
+    assert _upload(client).json()["created"] == 2
+    r = _upload(client)
+    assert r.status_code == 200
+    assert r.json() == {"ok": True, "created": 0, "merged": 2, "skipped": 1}
+    assert db.query(Lead).count() == 2
+
+
+def test_csv_duplicate_phone_in_one_file_merges(client, db, monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "s3cret")
+    data = VENDOR_CSV + b"Joanne,Tester,TERM,AGED,555.555.0100,,,,OK\n"
+
+    r = _upload(client, data=data)
+    assert r.status_code == 200
+    assert r.json() == {"ok": True, "created": 2, "merged": 1, "skipped": 1}
+
+    lead = db.query(Lead).filter(Lead.phone == "+15555550100").one()
+    mem = dict(
+        db.query(LeadMemory.key, LeadMemory.value)
+        .filter(LeadMemory.lead_id == lead.id)
+        .all()
+    )
+    # The later row's memory wins
+    assert mem["us_state"] == "OK"
+
+
+def test_csv_import_requires_admin_token(client, db, monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "s3cret")
+
+    r = _upload(client, token="wrong")
+    assert r.status_code == 401
+    assert db.query(Lead).count() == 0
+
+
+def test_read_csv_rows_arrow_and_stdlib_agree(monkeypatch):
+    pytest.importorskip("pyarrow")
+    from agencyvault_app import main
+
+    data = b"Jo , Tester,IUL,GOAT,+15555550100,,01/02/1970,jo@example.com,TX\nSam,Second,TERM,FRESH,0555,,,,FL\n"
+    want = [
+        ["Jo", "Tester", "IUL", "GOAT", "+15555550100", "", "01/02/1970", "jo@example.com", "TX"],
+        ["Sam", "Second", "TERM", "FRESH", "0555", "", "", "", "FL"],
+    ]
+
+    assert main.ARROW_OK
+    assert main.read_csv_rows(data) == want
+
+    monkeypatch.setattr(main, "ARROW_OK", False)
+    rows = main.read_csv_rows(data)
+    # csv.reader keeps the padding; normalize_csv_rows() strips it per cell
+    assert [[c.strip() for c in r] for r in rows] == want
+    assert main.normalize_csv_rows(rows) == main.normalize_csv_rows(want)
+
+
+def test_csv_import_without_pyarrow(client, db, monkeypatch):
+    from agencyvault_app import main
+
+    monkeypatch.setenv("ADMIN_TOKEN", "s3cret")
+    monkeypatch.setattr(main, "ARROW_OK", False)
+
+    r = _upload(client)
+    assert r.json()["created"] == 2
+
+
+def test_image_import_uses_async_ocr(client, db, monkeypatch):
+    from agencyvault_app import main
+
+    calls = []
+
+    async def fake_ocr(data):
+        calls.append(data)
+        return "Name: Jo Tester\nPhone: (555) 555-0100\nState: TX\n"
+
+    monkeypatch.setenv("ADMIN_TOKEN", "s3cret")
+    monkeypatch.setattr(main, "OCR_POOL_OK", True)
+    monkeypatch.setattr(main, "extract_text_from_image_bytes_async", fake_ocr, raising=False)
+
+    r = _upload(client, data=b"\x89PNG fake", filename="scan.png")
+    assert r.json()["created"] == 1
+    assert calls == [b"\x89PNG fake"]
+
+    lead = db.query(Lead).one()
+    assert lead.full_name == "Jo Tester"
+
+
+def test_large_csv_streams_in_batches(client, db, monkeypatch):
+    from agencyvault_app import main
+
+    def whole_file(data):
+        raise AssertionError("a spooled upload must not be read into memory")
+
+    monkeypatch.setenv("ADMIN_TOKEN", "s3cret")
+    monkeypatch.setattr(main, "CSV_ARROW_MAX_BYTES", 0)
+    monkeypatch.setattr(main, "read_csv_rows", whole_file)
+    monkeypatch.setattr(main, "IMPORT_BATCH_SIZE", 7)
+
+    rows = b"".join(b"Lead,N%03d,TERM,AGED,+1555555%04d\n" % (i, i) for i in range(50))
+    r = _upload(client, data=rows)
+    assert r.json() == {"ok": True, "created": 50, "merged": 0, "skipped": 0}
+    assert db.query(Lead).count() == 50
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import text
+
+from agencyvault_app.models import Lead, LeadMemory
+
+
+def test_orm_update_stamps_updated_at(db):
+    lead = Lead(full_name="Jo Tester", phone="+15555550100", state="NEW")
+    db.add(lead)
+    db.flush()
+    db.add(LeadMemory(lead_id=lead.id, key="tier", value="GOAT"))
+    db.commit()
+
+    old = datetime(2000, 1, 1)
+    db.execute(text("UPDATE leads SET updated_at = :t"), {"t": old})
+    db.execute(text("UPDATE lead_memory SET updated_at = :t"), {"t": old})
+    db.commit()
+
+    lead = db.get(Lead, lead.id)
+    lead.state = "WORKING"
+    mem = db.query(LeadMemory).one()
+    mem.value = "FRESH"
+    db.commit()
+
+    assert db.get(Lead, lead.id).updated_at > old
+    assert db.query(LeadMemory).one().updated_at > old
@@ -0,0 +1,9 @@
+def test_sw_js_revalidates_on_its_content_etag(client):
+    first = client.get("/sw.js")
+    assert first.status_code == 200
+    assert "last-modified" not in first.headers
+    etag = first.headers["etag"]
+
+    again = client.get("/sw.js", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag